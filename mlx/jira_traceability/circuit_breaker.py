@@ -0,0 +1,134 @@
+"""Circuit breaker to stop calling Jira after repeated failures"""
+from jira import JIRAError
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+from .jira_utils import format_jira_error
+
+OUTAGE_STATUS_CODES = (401, 403)
+OUTAGE_ERRORS = (JIRAError, RequestsConnectionError, Timeout)
+
+
+class CircuitOpenError(Exception):
+    """ Raised instead of calling Jira once the circuit breaker has tripped """
+
+
+SKIPPABLE_ERRORS = (CircuitOpenError, *OUTAGE_ERRORS)
+
+
+def is_outage_error(err):
+    """ Returns True if the given error indicates that Jira is unavailable or that the credentials are invalid.
+
+    The jira library re-raises some errors, e.g. the ones of user lookups, as a JIRAError without status code. The
+    error that caused such a JIRAError gets classified instead.
+
+    Args:
+        err (Exception): Error raised by a call to Jira
+
+    Returns:
+        bool: True for connection errors, timeouts and JIRAErrors with status code 401, 403 or 5xx; False otherwise
+    """
+    seen = set()
+    while err is not None and id(err) not in seen:
+        seen.add(id(err))
+        if isinstance(err, (RequestsConnectionError, Timeout)):
+            return True
+        if not isinstance(err, JIRAError):
+            return False
+        if err.status_code:
+            return err.status_code in OUTAGE_STATUS_CODES or err.status_code >= 500
+        err = err.__cause__ or err.__context__
+    return False
+
+
+def is_skippable_error(err):
+    """ Returns True if the given error means that the work at hand can be skipped because Jira is unavailable.
+
+    Catch SKIPPABLE_ERRORS and re-raise the ones for which this function returns False.
+
+    Args:
+        err (Exception): Error raised by a call to Jira or by the circuit breaker
+
+    Returns:
+        bool: True for errors raised by a tripped circuit breaker and for outage errors, see is_outage_error
+    """
+    return isinstance(err, CircuitOpenError) or is_outage_error(err)
+
+
+def guarded_call(jira, function, *args, **kwargs):
+    """ Calls the given function, e.g. a method of a Jira issue, through the circuit breaker of the given Jira interface
+    object, if it has one.
+
+    Args:
+        jira (jira.JIRA/CircuitBreaker): Jira interface object
+        function (callable): Function that calls Jira
+        *args: Positional arguments for the function
+        **kwargs: Keyword arguments for the function
+
+    Returns:
+        object: Return value of the function
+    """
+    if isinstance(jira, CircuitBreaker):
+        return jira.call(function, *args, **kwargs)
+    return function(*args, **kwargs)
+
+
+class CircuitBreaker:
+    """ Proxy for a Jira interface object that trips after a number of consecutive outage errors.
+
+    Once tripped, every call raises a CircuitOpenError right away instead of waiting for Jira to time out again.
+    """
+
+    def __init__(self, jira, threshold):
+        """ Constructor
+
+        Args:
+            jira (jira.JIRA): Jira interface object to guard
+            threshold (int): Number of consecutive outage errors after which the circuit breaker trips
+        """
+        self._jira = jira
+        self.threshold = threshold
+        self.consecutive_failures = 0
+        self.last_error = None
+
+    @property
+    def is_open(self):
+        """ bool: True if the circuit breaker has tripped """
+        return self.consecutive_failures >= self.threshold
+
+    def call(self, function, *args, **kwargs):
+        """ Calls the given function unless the circuit breaker has tripped, and keeps track of outage errors.
+
+        Args:
+            function (callable): Function that calls Jira
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            object: Return value of the function
+
+        Raises:
+            CircuitOpenError: The circuit breaker has tripped
+        """
+        if self.is_open:
+            raise CircuitOpenError("Jira circuit breaker tripped after {} consecutive failures; last error: {}"
+                                   .format(self.consecutive_failures, format_jira_error(self.last_error)))
+        try:
+            result = function(*args, **kwargs)
+        except Exception as err:
+            if is_outage_error(err):
+                self.consecutive_failures += 1
+                self.last_error = err
+            else:
+                self.consecutive_failures = 0
+            raise
+        self.consecutive_failures = 0
+        return result
+
+    def __getattr__(self, name):
+        attribute = getattr(self._jira, name)
+        if not callable(attribute):
+            return attribute
+
+        def guarded_attribute(*args, **kwargs):
+            return self.call(attribute, *args, **kwargs)
+
+        return guarded_attribute
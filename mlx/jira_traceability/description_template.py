@@ -0,0 +1,116 @@
+"""Rendering of Jira ticket descriptions based on the ``description_head`` and ``description_str_to_attr`` settings"""
+from re import compile as compile_regex, escape
+
+PARENT_PREFIX = 'parent.'
+SHARED_ITEM_ATTRIBUTES = ('docname',)
+
+
+class DescriptionTemplate:
+    """ Template for the description of Jira tickets, parsed once and rendered for each item in a single pass.
+
+    The head gets split into literal and placeholder segments. Each placeholder maps to the name of an attribute of the
+    item. Names prefixed with ``parent.`` refer to the item linked by the ``relationship_to_parent`` relationship.
+    A name is resolved as a Python attribute of the TraceableItem first, e.g. ``docname``, and as a traceable attribute,
+    e.g. ``assignee``, otherwise.
+
+    When all placeholders in the head resolve to values that are shared between items of the same document and parent,
+    the rendered head gets cached per document name and parent ID.
+    """
+
+    def __init__(self, head, str_to_attr):
+        """ Constructor
+
+        Args:
+            head (str): String to add to the start of each description
+            str_to_attr (dict): Mapping of placeholder strings to the name of the attribute that should take their place
+        """
+        self.str_to_attr = {str(placeholder): attr_name for placeholder, attr_name in str_to_attr.items()}
+        self.pattern = None
+        self.head_segments = [(False, head)] if head else []
+        if self.str_to_attr:
+            # longest placeholders first so that a placeholder containing another one takes precedence
+            placeholders = sorted(self.str_to_attr, key=len, reverse=True)
+            self.pattern = compile_regex('|'.join(escape(placeholder) for placeholder in placeholders))
+            self.head_segments = self._parse(head)
+        self.head_is_shared = all(not is_placeholder or self._is_shared(self.str_to_attr[text])
+                                  for is_placeholder, text in self.head_segments)
+        self._head_cache = {}
+
+    def _parse(self, head):
+        """ Splits the given string into a list of literal and placeholder segments.
+
+        Args:
+            head (str): String to parse
+
+        Returns:
+            list: List of tuples with a boolean, True for placeholders, and the text of the segment
+        """
+        segments = []
+        position = 0
+        for placeholder_match in self.pattern.finditer(head):
+            if placeholder_match.start() > position:
+                segments.append((False, head[position:placeholder_match.start()]))
+            segments.append((True, placeholder_match.group()))
+            position = placeholder_match.end()
+        if position < len(head):
+            segments.append((False, head[position:]))
+        return segments
+
+    @staticmethod
+    def _is_shared(attr_name):
+        """ Returns True if the value of the given attribute is the same for items of the same document and parent """
+        return attr_name.startswith(PARENT_PREFIX) or attr_name in SHARED_ITEM_ATTRIBUTES
+
+    @staticmethod
+    def _lookup(item, parent, attr_name):
+        """ Gets the value of the attribute with the given name as a string.
+
+        Args:
+            item (TraceableItem): Traceable item to create the Jira ticket for
+            parent (TraceableItem/None): Parent item of the traceable item, if any
+            attr_name (str): Name of the attribute, optionally prefixed with ``parent.``
+
+        Returns:
+            str: Value of the attribute; empty string if the parent is needed but missing
+        """
+        source = item
+        if attr_name.startswith(PARENT_PREFIX):
+            attr_name = attr_name[len(PARENT_PREFIX):]
+            source = parent
+            if source is None:
+                return ''
+        try:
+            return str(getattr(source, attr_name))
+        except AttributeError:
+            return source.get_attribute(attr_name)
+
+    def _render_head(self, item, parent):
+        """ Renders the head for the given item """
+        return ''.join(self._lookup(item, parent, self.str_to_attr[text]) if is_placeholder else text
+                       for is_placeholder, text in self.head_segments)
+
+    def clear_cache(self):
+        """ Releases the cached heads, e.g. when the items of a chunk have been processed """
+        self._head_cache.clear()
+
+    def render(self, item, body, parent=None):
+        """ Renders the description for the given item.
+
+        Args:
+            item (TraceableItem): Traceable item to create the Jira ticket for
+            body (str): Body of the item to append to the head; placeholders in it get replaced as well
+            parent (TraceableItem/None): Parent item of the traceable item, if any
+
+        Returns:
+            str: Description for the Jira ticket
+        """
+        if self.head_is_shared:
+            key = (getattr(item, 'docname', None), parent.identifier if parent is not None else None)
+            head = self._head_cache.get(key)
+            if head is None:
+                head = self._head_cache[key] = self._render_head(item, parent)
+        else:
+            head = self._render_head(item, parent)
+        if self.pattern is not None and body:
+            body = self.pattern.sub(lambda match: self._lookup(item, parent, self.str_to_attr[match.group()]), body)
+        return head + body
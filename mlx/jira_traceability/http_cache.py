@@ -0,0 +1,151 @@
+"""On-disk cache of Jira responses for read-mostly metadata, e.g. project components and user lookups"""
+import json
+import os
+import threading
+from re import compile as compile_regex
+from time import time
+from urllib.parse import urlencode
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from sphinx.util.logging import getLogger
+
+LOGGER = getLogger('mlx.jira_traceability')
+CACHEABLE_URL_REGEX = compile_regex(r'/rest/api/(\d+|latest)/(project/[^/?]+/components|user(/search|/picker|'
+                                    r'/assignable/search)?)/?(\?|$)')
+METADATA_CACHE_TTL = 3600
+
+_CACHES = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_metadata_cache(path, ttl=METADATA_CACHE_TTL):
+    """ Gets the metadata cache stored in the given file; Jira interface objects of the same run share one instance.
+
+    Args:
+        path (str): Path to the JSON file to store the cached responses in
+        ttl (float): Number of seconds during which a cached response gets used without revalidating it
+
+    Returns:
+        MetadataCache: Cache of metadata responses
+    """
+    with _CACHES_LOCK:
+        cache = _CACHES.get(path)
+        if cache is None:
+            cache = _CACHES[path] = MetadataCache(path, ttl)
+        cache.ttl = ttl
+        return cache
+
+
+class MetadataCache:
+    """ Cache of responses to GET requests for Jira metadata, keyed by URL and stored on disk.
+
+    A cached response gets used as is while it is younger than the TTL. After that, it gets revalidated with a
+    conditional request when the server provided an ETag or Last-Modified header, and fetched again otherwise.
+    """
+
+    def __init__(self, path, ttl=METADATA_CACHE_TTL):
+        """ Constructor
+
+        Args:
+            path (str): Path to the JSON file to store the cached responses in
+            ttl (float): Number of seconds during which a cached response gets used without revalidating it
+        """
+        self.path = path
+        self.ttl = ttl
+        self.entries = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding='utf-8') as file:
+                self.entries = json.load(file)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as err:
+            LOGGER.warning("Ignoring invalid Jira metadata cache {}: {}".format(path, err))
+
+    @staticmethod
+    def is_cacheable(method, url):
+        """ Returns True if the response to the request with the given method and URL may be cached """
+        return method.upper() == 'GET' and bool(CACHEABLE_URL_REGEX.search(url))
+
+    def install(self, session):
+        """ Makes the given session use this cache for requests for metadata.
+
+        Args:
+            session (requests.Session): Session of the Jira interface object
+        """
+        original_request = session.request
+
+        def cached_request(method, url, **kwargs):
+            if not self.is_cacheable(method, url):
+                return original_request(method, url, **kwargs)
+            return self.request(original_request, method, url, **kwargs)
+
+        session.request = cached_request
+
+    def request(self, send, method, url, **kwargs):
+        """ Serves the request from the cache or sends it, conditionally if possible, and caches the response.
+
+        Args:
+            send (callable): Function to send the request with
+            method (str): HTTP method
+            url (str): URL of the request
+            **kwargs: Additional keyword arguments of the request
+
+        Returns:
+            requests.Response: Cached or received response
+        """
+        key = url
+        if kwargs.get('params'):
+            params = {name: value for name, value in kwargs['params'].items() if value is not None}
+            key = "{}?{}".format(url, urlencode(sorted(params.items()), doseq=True))
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry and time() - entry['stored'] < self.ttl:
+            return self.to_response(entry)
+
+        if entry:
+            headers = dict(kwargs.get('headers') or {})
+            if entry['headers'].get('ETag'):
+                headers['If-None-Match'] = entry['headers']['ETag']
+            if entry['headers'].get('Last-Modified'):
+                headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+            kwargs['headers'] = headers
+        response = send(method, url, **kwargs)
+        if response.status_code == 304 and entry:
+            entry = dict(entry, stored=time())
+        elif response.status_code == 200:
+            entry = {
+                'stored': time(),
+                'url': response.url or url,
+                'headers': {name: response.headers[name] for name in ('Content-Type', 'ETag', 'Last-Modified')
+                            if name in response.headers},
+                'content': response.content.decode('utf-8'),
+            }
+        else:
+            return response
+        with self._lock:
+            self.entries[key] = entry
+            self.save()
+        return self.to_response(entry)
+
+    @staticmethod
+    def to_response(entry):
+        """ Builds a response object from the given cache entry """
+        response = Response()
+        response.status_code = 200
+        response.url = entry['url']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = 'utf-8'
+        response._content = entry['content'].encode('utf-8')  # pylint: disable=protected-access
+        return response
+
+    def save(self):
+        """ Stores the cached responses atomically """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.entries, file)
+        os.replace(tmp_path, self.path)
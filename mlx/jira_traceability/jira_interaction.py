@@ -1,19 +1,49 @@
 """Functionality to interact with Jira"""
-from re import match, search
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from re import compile as compile_regex, search
+from time import monotonic
 
 from jira import JIRA, JIRAError
 from sphinx.util.logging import getLogger
-from .jira_utils import format_jira_error, validate_components
+from .circuit_breaker import (OUTAGE_ERRORS, SKIPPABLE_ERRORS, CircuitBreaker, CircuitOpenError, guarded_call,
+                              is_outage_error, is_skippable_error)
+from .description_template import DescriptionTemplate
+from .http_cache import METADATA_CACHE_TTL, get_metadata_cache
+from .jira_utils import (format_jira_error, jql_field_name, load_item_ids, save_item_ids, search_jira_issues,
+                         validate_components)
+from .offline_queue import enqueue_tickets, load_queue, save_queue
+from .profiling import track_operation, wrap_client
+from .session_cache import SESSION_CACHE_TTL, SessionCache
 
 LOGGER = getLogger('mlx.jira_traceability')
+DEDUP_BATCH_SIZE = 200
+CIRCUIT_BREAKER_THRESHOLD = 5
+FLUSH_WORKERS = 4
 
+ParentInfo = namedtuple('ParentInfo', 'parent_id parent summary_prefix attendees')
 
-def create_jira_issues(settings, traceability_collection):
+
+class TimeBudgetExceeded(Exception):
+    """ Reason for not processing an item because the time budget of the run has been used up """
+
+
+def create_jira_issues(settings, traceability_collection, parallel=1):
     """ Creates Jira issues using configuration variable ``traceability_jira_automation``.
 
+    When ``offline_queue_file`` is configured and Jira is unreachable, the requests to create the tickets are stored in
+    that file instead. The queue gets flushed by the first run that can reach Jira.
+
+    When ``time_budget_seconds`` is configured, no new items get processed once the time budget has been used up.
+
+    When ``pending_enrichments_file`` is configured, the issues of which the effort, watchers and assignee could not be
+    set by a previous run get enriched first.
+
     Args:
         settings (dict): Settings relevant to this feature
         traceability_collection (TraceableCollection): Collection of all traceability items
+        parallel (int): Number of parallel processes of the Sphinx build, used as the number of workers to create
+            Jira tickets concurrently unless the ``workers`` setting is configured
     """
     mandatory_keys = ('api_endpoint', 'username', 'password', 'jira_field_id', 'item_to_ticket_regex', 'issue_type')
     missing_keys = []
@@ -24,30 +54,150 @@ def create_jira_issues(settings, traceability_collection):
         return LOGGER.warning("Jira interaction failed: configuration is missing mandatory values for keys {}"
                               .format(missing_keys))
 
-    issue_type = settings['issue_type']
+    deadline = None
+    if settings.get('time_budget_seconds'):
+        deadline = monotonic() + float(settings['time_budget_seconds'])
+    general_fields = build_general_fields(settings)
+    relevant_item_ids = traceability_collection.get_items(settings['item_to_ticket_regex'])
+    if settings.get('pending_items_file'):
+        relevant_item_ids = prioritize_item_ids(relevant_item_ids, load_item_ids(settings['pending_items_file']))
+    offline_queue_file = settings.get('offline_queue_file')
+    pending_enrichments_file = settings.get('pending_enrichments_file')
+    if (relevant_item_ids or (offline_queue_file and load_queue(offline_queue_file)) or
+            (pending_enrichments_file and load_queue(pending_enrichments_file))):
+        try:
+            try:
+                jira = connect_to_jira(settings)
+            except OUTAGE_ERRORS as err:
+                if not offline_queue_file or not is_outage_error(err):
+                    raise
+                tickets = build_tickets(relevant_item_ids, general_fields, settings, traceability_collection)
+                enqueue_tickets(offline_queue_file, tickets)
+                msg = "Jira is unreachable ({}); queued {} ticket(s) in {}".format(format_jira_error(err),
+                                                                                   len(tickets), offline_queue_file)
+                if not settings.get('errors_to_warnings', True):
+                    raise Exception(msg) from err
+                return LOGGER.warning(msg)
+            if pending_enrichments_file:
+                enrich_pending_issues(jira, settings, deadline)
+            if offline_queue_file:
+                _, resolved_item_ids = flush_offline_queue(jira, settings, deadline)
+                relevant_item_ids = [item_id for item_id in relevant_item_ids if item_id not in resolved_item_ids]
+            workers = int(settings.get('workers', 0)) or parallel
+            create_unique_issues(relevant_item_ids, jira, general_fields, settings, traceability_collection, workers,
+                                 deadline)
+        except JIRAError as err:
+            error_msg = format_jira_error(err)
+            raise Exception(error_msg) from err
+
+
+def connect_to_jira(settings):
+    """ Constructs the Jira interface object, guarded by a circuit breaker.
+
+    If ``metadata_cache_file`` is configured, responses for project components and user lookups are cached on disk.
+    If ``session_cache_file`` is configured, the cookies of the authenticated session are reused across builds,
+    without sending the credentials. When a reused session gets rejected, a new one is started with the credentials.
+
+    Args:
+        settings (dict): Configuration for this feature
+
+    Returns:
+        CircuitBreaker: Jira interface object that stops calling Jira after repeated failures
+    """
+    options = {"server": settings['api_endpoint']}
+    basic_auth = (settings['username'], settings['password'])
+    session_cache = None
+    jira = None
+    if settings.get('session_cache_file'):
+        session_cache = SessionCache(settings['session_cache_file'], settings['api_endpoint'], settings['username'],
+                                     float(settings.get('session_cache_ttl', SESSION_CACHE_TTL)))
+        cookies = session_cache.load()
+        if cookies:
+            with track_operation('connect'):
+                try:
+                    # authenticate with the cookies only and validate the session right away
+                    jira = JIRA(dict(options, cookies=cookies), validate=True)
+                except JIRAError as err:
+                    if err.status_code not in (None, 401):
+                        raise
+                    session_cache.clear()
+            if jira is not None:
+                session_cache.install(jira._session, basic_auth)  # pylint: disable=protected-access
+    if jira is None:
+        with track_operation('connect'):
+            jira = JIRA(options, basic_auth=basic_auth)
+        if session_cache:
+            session_cache.install(jira._session)  # pylint: disable=protected-access
+    if settings.get('metadata_cache_file'):
+        metadata_cache = get_metadata_cache(settings['metadata_cache_file'],
+                                            float(settings.get('metadata_cache_ttl', METADATA_CACHE_TTL)))
+        metadata_cache.install(jira._session)  # pylint: disable=protected-access
+    return CircuitBreaker(wrap_client(jira),
+                          int(settings.get('circuit_breaker_threshold', CIRCUIT_BREAKER_THRESHOLD)))
+
+
+def build_general_fields(settings):
+    """ Builds the fields that are not item-specific.
+
+    Args:
+        settings (dict): Configuration for this feature
+
+    Returns:
+        dict: Dictionary containing the issue type and, if configured, the components
+    """
     general_fields = {}
-    general_fields['issuetype'] = {'name': issue_type}
+    general_fields['issuetype'] = {'name': settings['issue_type']}
     components = []
     for comp in settings.get('components', '').split(','):
         if comp:
             components.append({'name': comp.strip()})
     if components:
         general_fields['components'] = components
+    return general_fields
 
-    relevant_item_ids = traceability_collection.get_items(settings['item_to_ticket_regex'])
-    if relevant_item_ids:
-        try:
-            jira = JIRA({"server": settings['api_endpoint']}, basic_auth=(settings['username'], settings['password']))
-            create_unique_issues(relevant_item_ids, jira, general_fields, settings, traceability_collection)
-        except JIRAError as err:
-            error_msg = format_jira_error(err)
-            raise Exception(error_msg) from err
 
+def prioritize_item_ids(item_ids, pending_item_ids):
+    """ Orders the given item IDs so that the ones left unprocessed by a previous run come first.
+
+    Args:
+        item_ids (list): List of item IDs to process
+        pending_item_ids (list): List of item IDs that were left unprocessed by a previous run
 
-def create_unique_issues(item_ids, jira, general_fields, settings, traceability_collection):
+    Returns:
+        list: Item IDs to process, starting with the pending ones that are still relevant
+    """
+    relevant_item_ids = set(item_ids)
+    prioritized = [item_id for item_id in pending_item_ids if item_id in relevant_item_ids]
+    prioritized_set = set(prioritized)
+    return prioritized + [item_id for item_id in item_ids if item_id not in prioritized_set]
+
+
+def create_unique_issues(item_ids, jira, general_fields, settings, traceability_collection, workers=1,
+                         deadline=None):
     """ Creates a Jira ticket for each item matching the configured regex.
 
-    Duplication is avoided by first querying Jira issues filtering on project and summary.
+    Duplication is avoided by first querying Jira issues filtering on project and summary. When ``item_id_field`` is
+    configured, the item ID gets stored in that field as well and existing issues are looked up with exact-match
+    queries, batched per project. Items that are not found this way are still checked with the query on summary, to
+    find tickets created before ``item_id_field`` was configured, unless ``item_id_search_fallback`` is disabled.
+
+    The items are processed in chunks of ``chunk_size`` items, if configured. All state that is specific to the items of
+    a chunk is released before the next chunk gets processed, which bounds memory usage for huge collections.
+
+    Items that could not be processed because Jira is unavailable are reported in a single warning. Their tickets get
+    added to the ``offline_queue_file`` if configured. Otherwise, if ``pending_items_file`` is configured, the item IDs
+    are stored to be processed first in the next run. The same goes for the items that are not processed because the
+    deadline is near, after finishing the items in flight. Enrichment gets skipped once the deadline has passed.
+    Issues that have not been enriched are stored in ``pending_enrichments_file``, if configured, to be enriched by the
+    next run.
+    When ``errors_to_warnings`` is disabled, a single exception gets raised instead of the warning about the items
+    that failed, after storing them.
+
+    With multiple workers, the Jira tickets of each chunk are created concurrently, with a separate Jira interface
+    object per worker.
+
+    All Jira tickets of a chunk are created first. The slower calls to set their effort, watchers and assignee are
+    postponed until afterwards and are made by one thread per Jira interface object, at most ``enrichment_workers``.
 
     Args:
         item_ids (list): List of item IDs
@@ -55,127 +205,608 @@ def create_unique_issues(item_ids, jira, general_fields, settings, traceability_
         general_fields (dict): Dictionary containing fields that are not item-specific
         settings (dict): Configuration for this feature
         traceability_collection (TraceableCollection): Collection of all traceability items
+        workers (int): Number of workers to create Jira tickets concurrently
+        deadline (float/None): Value of time.monotonic() after which no new items get processed; None for no deadline
+
+    Returns:
+        dict: Mapping of the ID of each item to the key of the Jira issue that has been created for it
     """
     # Cache for validated components per project to avoid repeated validation
     validated_components_cache = {}
+    description_template = DescriptionTemplate(settings.get('description_head', ''),
+                                               settings.get('description_str_to_attr', {}))
+    chunk_size = max(int(settings.get('chunk_size', 0)) or len(item_ids), 1)
+    created_issues = {}
+    unprocessed_items = {}
+    unenriched = []
+    jira_clients = [jira] + [None] * (max(int(workers), 1) - 1)
+    for start in range(0, len(item_ids), chunk_size):
+        if deadline is not None and monotonic() >= deadline:
+            unprocessed_items.update(dict.fromkeys(item_ids[start:], TimeBudgetExceeded()))
+            break
+        tickets = build_tickets(item_ids[start:start + chunk_size], general_fields, settings, traceability_collection,
+                                description_template)
+        enrichments = []
+        created_issues.update(create_unique_issues_for_chunk(tickets, jira_clients, settings,
+                                                             validated_components_cache, unprocessed_items,
+                                                             enrichments, deadline))
+        unenriched.extend(enrich_issues(enrichments, int(settings.get('enrichment_workers', 0)) or len(jira_clients),
+                                        deadline))
+        description_template.clear_cache()
+
+    deferred_item_ids = [item_id for item_id, err in unprocessed_items.items() if isinstance(err, TimeBudgetExceeded)]
+    failed_items = {item_id: err for item_id, err in unprocessed_items.items()
+                    if not isinstance(err, TimeBudgetExceeded)}
+    failure_msg = ''
+    if failed_items:
+        last_error = list(failed_items.values())[-1]
+        if not isinstance(last_error, CircuitOpenError):
+            last_error = format_jira_error(last_error)
+        failure_msg = "Jira interaction skipped {} item(s) because Jira is unavailable: {}".format(
+            len(failed_items), last_error)
+        if settings.get('errors_to_warnings', True):
+            LOGGER.warning(failure_msg)
+    if deferred_item_ids:
+        LOGGER.warning("Jira interaction stopped after {} s because of the time budget; {} item(s) are left for the "
+                       "next run".format(settings['time_budget_seconds'], len(deferred_item_ids)))
+    if settings.get('offline_queue_file'):
+        if failed_items:
+            enqueue_tickets(settings['offline_queue_file'],
+                            build_tickets(list(failed_items), general_fields, settings, traceability_collection))
+        pending_item_ids = deferred_item_ids
+    else:
+        pending_item_ids = list(unprocessed_items)
+    if settings.get('pending_items_file'):
+        save_item_ids(settings['pending_items_file'], pending_item_ids)
+    if unenriched and settings.get('pending_enrichments_file'):
+        enqueue_tickets(settings['pending_enrichments_file'],
+                        [dict(ticket, issue_key=issue.key) for _, issue, ticket in unenriched])
+    if failure_msg and not settings.get('errors_to_warnings', True):
+        raise Exception(failure_msg)
+    return created_issues
+
+
+def create_unique_issues_for_chunk(tickets, jira_clients, settings, validated_components_cache, unprocessed_items,
+                                   enrichments=None, deadline=None):
+    """ Creates a Jira ticket for each of the given ticket requests, unless it exists already.
+
+    The ticket requests are split in contiguous shards, one per Jira interface object, which are processed
+    concurrently. Each worker looks up the existing issues for its own shard. The results are merged in the order of
+    the ticket requests.
 
-    for item_id in item_ids:
-        fields = {}
-        item = traceability_collection.get_item(item_id)
-        project_id_or_key = determine_jira_project(settings.get('project_key_regex', ''),
-                                                   settings.get('project_key_prefix', ''),
-                                                   settings.get('default_project', ''),
-                                                   item_id)
-        if not project_id_or_key:
-            LOGGER.warning("Could not determine a JIRA project key or id for item {!r}".format(item_id))
-            continue
+    Args:
+        tickets (list): List of ticket requests, see build_ticket
+        jira_clients (list): Jira interface objects, one per worker; None for workers that have yet to connect
+        settings (dict): Configuration for this feature
+        validated_components_cache (dict): Cache of validated components per project, shared between chunks
+        unprocessed_items (dict): Mapping of item ID to the error that prevented processing it, to extend
+        enrichments (list/None): List to postpone the enrichment of the created issues to; None to enrich them right
+            away
+        deadline (float/None): Value of time.monotonic() after which no new items get processed; None for no deadline
 
-        assignee = item.get_attribute('assignee').strip()
-        attendees, jira_field = get_info_from_relationship(item, settings['relationship_to_parent'],
-                                                           traceability_collection)
-        username = settings['username']
-        if '@' in username:
-            suffix = username[username.index('@'):]
-            assignee = f"{assignee}{suffix}".lower()
-            attendees = [f"{attendee}{suffix}".lower() for attendee in attendees]
+    Returns:
+        dict: Mapping of the ID of each item to the key of the Jira issue that has been created for it
+    """
+    workers = min(len(jira_clients), len(tickets))
+    if workers <= 1:
+        return create_unique_issues_for_tickets(tickets, jira_clients[0], settings, validated_components_cache,
+                                                unprocessed_items, enrichments, deadline)
+    try:
+        # validate components up front so that the workers only read from the cache
+        validate_components_for_tickets(jira_clients[0], tickets, validated_components_cache)
+    except SKIPPABLE_ERRORS as err:
+        if not is_skippable_error(err):
+            raise
+        unprocessed_items.update(dict.fromkeys((ticket['item_id'] for ticket in tickets), err))
+        return {}
+
+    shard_size = -(-len(tickets) // workers)
+    shards = [tickets[start:start + shard_size] for start in range(0, len(tickets), shard_size)]
+    shard_unprocessed_items = [{} for _ in shards]
+    shard_enrichments = [None if enrichments is None else [] for _ in shards]
+
+    def process_shard(index):
+        if jira_clients[index] is None:
+            try:
+                jira_clients[index] = connect_to_jira(settings)
+            except OUTAGE_ERRORS as err:
+                if not is_outage_error(err):
+                    raise
+                shard_unprocessed_items[index].update(dict.fromkeys((ticket['item_id'] for ticket in shards[index]),
+                                                                    err))
+                return {}
+        return create_unique_issues_for_tickets(shards[index], jira_clients[index], settings,
+                                                validated_components_cache, shard_unprocessed_items[index],
+                                                shard_enrichments[index], deadline)
+
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        results = list(executor.map(process_shard, range(len(shards))))
+    created_issues = {}
+    for shard_created_issues, shard_unprocessed, shard_enriched in zip(results, shard_unprocessed_items,
+                                                                       shard_enrichments):
+        created_issues.update(shard_created_issues)
+        unprocessed_items.update(shard_unprocessed)
+        if enrichments is not None:
+            enrichments.extend(shard_enriched)
+    return created_issues
+
+
+def create_unique_issues_for_tickets(tickets, jira, settings, validated_components_cache, unprocessed_items,
+                                     enrichments=None, deadline=None):
+    """ Creates a Jira ticket for each of the given ticket requests sequentially, unless it exists already.
+
+    Items that fail because Jira is unavailable are skipped. Once the circuit breaker has tripped, all remaining items
+    are skipped right away. No new items get processed when the remaining time before the deadline is shorter than the
+    average time spent per item so far.
 
-        jira_field_id = settings['jira_field_id']
-        jira_field_query_value = escape_special_characters(jira_field)
-        # Use enhanced_search_issues for Jira Cloud compatibility
+    Args:
+        tickets (list): List of ticket requests, see build_ticket
+        jira (jira.JIRA): Jira interface object
+        settings (dict): Configuration for this feature
+        validated_components_cache (dict): Cache of validated components per project, shared between chunks
+        unprocessed_items (dict): Mapping of item ID to the error that prevented processing it, to extend
+        enrichments (list/None): List to postpone the enrichment of the created issues to; None to enrich them right
+            away
+        deadline (float/None): Value of time.monotonic() after which no new items get processed; None for no deadline
+
+    Returns:
+        dict: Mapping of the ID of each item to the key of the Jira issue that has been created for it
+    """
+    created_issues = {}
+    try:
+        existing_issues = find_existing_issues_for_tickets(jira, tickets, settings)
+    except SKIPPABLE_ERRORS as err:
+        if not is_skippable_error(err):
+            raise
+        unprocessed_items.update(dict.fromkeys((ticket['item_id'] for ticket in tickets), err))
+        return created_issues
+
+    start = monotonic()
+    for index, ticket in enumerate(tickets):
+        if deadline is not None:
+            average_duration = (monotonic() - start) / index if index else 0.0
+            if monotonic() + average_duration >= deadline:
+                unprocessed_items.update(dict.fromkeys((remaining['item_id'] for remaining in tickets[index:]),
+                                                       TimeBudgetExceeded()))
+                break
         try:
-            matches = jira.enhanced_search_issues(
-                jql_str="project={} and {} ~ {!r}".format(project_id_or_key, jira_field_id, jira_field_query_value),
-                maxResults=1,
-            )
-        except AttributeError:
-            # Fallback to legacy search_issues for older jira library versions
-            matches = jira.search_issues(
-                jql_str="project={} and {} ~ {!r}".format(project_id_or_key, jira_field_id, jira_field_query_value),
-                maxResults=1,
+            issue_key = create_unique_issue(ticket, existing_issues, jira, settings, validated_components_cache,
+                                            enrichments)
+        except CircuitOpenError as err:
+            unprocessed_items.update(dict.fromkeys((remaining['item_id'] for remaining in tickets[index:]), err))
+            break
+        except OUTAGE_ERRORS as err:
+            if not is_outage_error(err):
+                raise
+            unprocessed_items[ticket['item_id']] = err
+            continue
+        if issue_key:
+            created_issues[ticket['item_id']] = issue_key
+    return created_issues
+
+
+def build_tickets(item_ids, general_fields, settings, traceability_collection, description_template=None):
+    """ Builds the requests to create a Jira ticket for each of the given items, without contacting Jira.
+
+    Args:
+        item_ids (list): List of item IDs
+        general_fields (dict): Dictionary containing fields that are not item-specific
+        settings (dict): Configuration for this feature
+        traceability_collection (TraceableCollection): Collection of all traceability items
+        description_template (DescriptionTemplate): Template to render the description of each ticket; None to build
+            one from the settings
+
+    Returns:
+        list: List of ticket requests, see build_ticket; items without a Jira project are left out
+    """
+    if description_template is None:
+        description_template = DescriptionTemplate(settings.get('description_head', ''),
+                                                   settings.get('description_str_to_attr', {}))
+    user_suffix = ''
+    if '@' in settings['username']:
+        user_suffix = settings['username'][settings['username'].index('@'):]
+    parent_index = build_parent_index(item_ids, settings['relationship_to_parent'], traceability_collection,
+                                      user_suffix)
+    tickets = []
+    for item_id in item_ids:
+        ticket = build_ticket(item_id, general_fields, settings, traceability_collection, description_template,
+                              parent_index.get(item_id), user_suffix)
+        if ticket:
+            tickets.append(ticket)
+    return tickets
+
+
+def build_ticket(item_id, general_fields, settings, traceability_collection, description_template, parent_info=None,
+                 user_suffix=''):
+    """ Builds the request to create a Jira ticket for the given item, without contacting Jira.
+
+    The request is a JSON-serializable dictionary, which allows to store it in the offline queue.
+
+    Args:
+        item_id (str): ID of the item to create a Jira ticket for
+        general_fields (dict): Dictionary containing fields that are not item-specific
+        settings (dict): Configuration for this feature
+        traceability_collection (TraceableCollection): Collection of all traceability items
+        description_template (DescriptionTemplate): Template to render the description of the ticket
+        parent_info (ParentInfo/None): Resolved parent of the item, see build_parent_index; None if it has no parent
+        user_suffix (str): Suffix to add to the assignee, e.g. '@example.com'; the attendees of the parent info
+            already have it
+
+    Returns:
+        dict/None: Ticket request with keys 'item_id', 'project', 'fields', 'attendees', 'assignee', 'effort' and
+            'content'; None if no Jira project could be determined for the item
+    """
+    project_id_or_key = determine_jira_project(settings.get('project_key_regex', ''),
+                                               settings.get('project_key_prefix', ''),
+                                               settings.get('default_project', ''),
+                                               item_id)
+    if not project_id_or_key:
+        LOGGER.warning("Could not determine a JIRA project key or id for item {!r}".format(item_id))
+        return None
+
+    fields = {}
+    item = traceability_collection.get_item(item_id)
+    assignee = item.get_attribute('assignee').strip()
+    if user_suffix:
+        assignee = f"{assignee}{user_suffix}".lower()
+    jira_field = item.caption
+    attendees = ()
+    parent = None
+    if parent_info:
+        jira_field = parent_info.summary_prefix + jira_field
+        attendees = parent_info.attendees
+        parent = parent_info.parent
+
+    # project field must be a dict with key or id for newer Jira API
+    if str(project_id_or_key).isdigit():
+        fields['project'] = {'id': project_id_or_key}
+    else:
+        fields['project'] = {'key': project_id_or_key}
+    fields[settings['jira_field_id']] = jira_field
+    item_id_field = settings.get('item_id_field', '')
+    if item_id_field:
+        fields[item_id_field] = [item_id]
+    body = item.content
+    if not body:
+        body = item.caption
+
+    fields['description'] = description_template.render(item, body, parent)
+
+    if assignee and not settings.get('notify_watchers', False):
+        # Let the JIRA library handle user resolution automatically
+        fields['assignee'] = {'name': assignee}
+        assignee = ''
+
+    return {
+        'item_id': item_id,
+        'project': project_id_or_key,
+        'fields': {**fields, **general_fields},
+        'attendees': attendees,
+        'assignee': assignee,
+        'effort': item.get_attribute('effort'),
+        'content': item.content,
+    }
+
+
+def find_existing_issues_for_tickets(jira, tickets, settings):
+    """ Finds the items of the given ticket requests that already exist in Jira, if ``item_id_field`` is configured.
+
+    Args:
+        jira (jira.JIRA): Jira interface object
+        tickets (list): List of ticket requests, see build_ticket
+        settings (dict): Configuration for this feature
+
+    Returns:
+        dict: Mapping of each item ID that already exists in Jira to the key of the issue containing it
+    """
+    item_id_field = settings.get('item_id_field', '')
+    if not item_id_field:
+        return {}
+    item_ids_per_project = {}
+    for ticket in tickets:
+        item_ids_per_project.setdefault(ticket['project'], []).append(ticket['item_id'])
+    return find_existing_item_ids(jira, item_ids_per_project, item_id_field)
+
+
+def validate_components_for_tickets(jira, tickets, validated_components_cache):
+    """ Validates the components of the given ticket requests once per project.
+
+    Args:
+        jira (jira.JIRA): Jira interface object
+        tickets (list): List of ticket requests, see build_ticket
+        validated_components_cache (dict): Cache of validated components per project, to extend
+    """
+    for ticket in tickets:
+        project_id_or_key = ticket['project']
+        if 'components' in ticket['fields'] and project_id_or_key not in validated_components_cache:
+            validated_components_cache[project_id_or_key] = validate_components(
+                jira, project_id_or_key, ticket['fields']['components']
             )
+
+
+def create_unique_issue(ticket, existing_issues, jira, settings, validated_components_cache, enrichments=None):
+    """ Creates a Jira ticket for the given ticket request, unless it exists already.
+
+    Args:
+        ticket (dict): Ticket request, see build_ticket
+        existing_issues (dict): Mapping of item IDs that already exist in Jira to the key of their issue
+        jira (jira.JIRA): Jira interface object
+        settings (dict): Configuration for this feature
+        validated_components_cache (dict): Cache of validated components per project
+        enrichments (list/None): List to postpone the enrichment of the issue to; None to enrich it right away
+
+    Returns:
+        str/None: Key of the newly created Jira issue; None if no issue has been created
+    """
+    item_id = ticket['item_id']
+    project_id_or_key = ticket['project']
+    fields = dict(ticket['fields'])
+    issue_type = fields['issuetype']['name']
+    item_id_field = settings.get('item_id_field', '')
+    if item_id_field and item_id in existing_issues:
+        if settings.get('warn_if_exists', False):
+            LOGGER.warning("Won't create a {} for item {!r} because Jira issue {} already has this item ID in "
+                           "field {!r}".format(issue_type, item_id, existing_issues[item_id], item_id_field))
+        return None
+    if not item_id_field or settings.get('item_id_search_fallback', True):
+        # tickets created before item_id_field was configured can only be found by their summary
+        jira_field_id = settings['jira_field_id']
+        jira_field_query_value = escape_special_characters(fields[jira_field_id])
+        matches = search_jira_issues(
+            jira,
+            "project={} and {} ~ {!r}".format(project_id_or_key, jira_field_id, jira_field_query_value),
+            maxResults=1,
+        )
         if matches:
             if settings.get('warn_if_exists', False):
                 LOGGER.warning("Won't create a {} for item {!r} because the Jira API query to check to prevent "
-                               "duplication returned {}".format(general_fields['issuetype']['name'], item_id, matches))
-            continue
+                               "duplication returned {}".format(issue_type, item_id, matches))
+            return None
+
+    # Validate components against Jira project (cached per project)
+    if 'components' in fields:
+        if project_id_or_key not in validated_components_cache:
+            # Validate components for this project and cache the result
+            validated_components_cache[project_id_or_key] = validate_components(
+                jira, project_id_or_key, fields['components']
+            )
+        # Use cached validated components
+        fields['components'] = validated_components_cache[project_id_or_key]
+
+    issue = push_item_to_jira(jira, fields, ticket, enrichments)
+    print("mlx.jira-traceability: created Jira ticket for item {} here: {}".format(item_id, issue.permalink()))
+    return issue.key
 
-        # project field must be a dict with key or id for newer Jira API
-        if str(project_id_or_key).isdigit():
-            fields['project'] = {'id': project_id_or_key}
-        else:
-            fields['project'] = {'key': project_id_or_key}
-        fields[jira_field_id] = jira_field
-        body = item.content
-        if not body:
-            body = item.caption
-
-        description = settings.get('description_head', '') + body
-        for str_to_replace, attr_name in settings.get('description_str_to_attr', {}).items():
-            attribute = getattr(item, attr_name)
-            description = description.replace(str(str_to_replace), str(attribute))
-        fields['description'] = description
-
-        if assignee and not settings.get('notify_watchers', False):
-            # Let the JIRA library handle user resolution automatically
-            fields['assignee'] = {'name': assignee}
-            assignee = ''
 
-        # Validate components against Jira project (cached per project)
-        project_general_fields = general_fields.copy()
-        if 'components' in project_general_fields:
-            if project_id_or_key not in validated_components_cache:
-                # Validate components for this project and cache the result
-                validated_components_cache[project_id_or_key] = validate_components(
-                    jira, project_id_or_key, project_general_fields['components']
-                )
-            # Use cached validated components
-            project_general_fields['components'] = validated_components_cache[project_id_or_key]
+def flush_offline_queue(jira, settings, deadline=None):
+    """ Creates the Jira tickets that have been queued in ``offline_queue_file`` while Jira was unreachable.
 
-        issue = push_item_to_jira(jira, {**fields, **project_general_fields}, item, attendees, assignee)
-        print("mlx.jira-traceability: created Jira ticket for item {} here: {}".format(item_id, issue.permalink()))
+    Duplicates are checked for and tickets are created concurrently by ``flush_workers`` threads, each with its own
+    Jira interface object, see create_unique_issues_for_chunk. Tickets that could not be processed because Jira is
+    unavailable or because the deadline has passed remain in the queue.
 
+    Args:
+        jira (jira.JIRA): Jira interface object
+        settings (dict): Configuration for this feature
+        deadline (float/None): Value of time.monotonic() after which no more tickets get created; None for no deadline
 
-def push_item_to_jira(jira, fields, item, attendees, assignee):
+    Returns:
+        dict: Mapping of the ID of each item to the key of the Jira issue that has been created for it
+        set: IDs of the items that have been processed, i.e. for which an issue has been created or already existed
+    """
+    queue_file = settings['offline_queue_file']
+    tickets = load_queue(queue_file)
+    if not tickets:
+        return {}, set()
+    unprocessed_items = {}
+    workers = max(int(settings.get('flush_workers', FLUSH_WORKERS)), 1)
+    created_issues = create_unique_issues_for_chunk(tickets, [jira] + [None] * (workers - 1), settings, {},
+                                                    unprocessed_items, deadline=deadline)
+    save_queue(queue_file, [ticket for ticket in tickets if ticket['item_id'] in unprocessed_items])
+    deferred_count = sum(isinstance(err, TimeBudgetExceeded) for err in unprocessed_items.values())
+    if len(unprocessed_items) > deferred_count:
+        LOGGER.warning("{} queued ticket(s) remain in {} because Jira is unavailable"
+                       .format(len(unprocessed_items) - deferred_count, queue_file))
+    if deferred_count:
+        LOGGER.warning("{} queued ticket(s) remain in {} because of the time budget".format(deferred_count, queue_file))
+    return created_issues, {ticket['item_id'] for ticket in tickets if ticket['item_id'] not in unprocessed_items}
+
+
+def push_item_to_jira(jira, fields, ticket, enrichments=None):
     """ Pushes the request to create a ticket on Jira for the given item.
 
-    The value of the effort option gets added to the Estimated field of the time tracking section. On failure, it gets
-    appended to the description instead.
-    The attendees are added to the watchers field. A warning is raised for each error returned by Jira.
-    The assignee can be set as the last step. When this results in a change in the ticket, the watchers get notified.
+    The ticket gets enriched right away, see enrich_issue, unless a list of enrichments is given to postpone it to.
 
     Args:
         jira (jira.JIRA): Jira interface object
-        general_fields (dict): Dictionary containing all fields to include in the initial creation of the Jira ticket
-        item (TraceableItem): Traceable item to create the Jira ticket for
-        attendees (list): List of attendees that should get added to the watchers field
-        assignee (str): User to assign to the issue as a last and separate call to Jira; empty to skip this step
+        fields (dict): Dictionary containing all fields to include in the initial creation of the Jira ticket
+        ticket (dict): Ticket request, see build_ticket
+        enrichments (list/None): List to add the Jira interface object, issue and ticket request to, to enrich the
+            issue later; None to enrich the issue right away
 
     Returns:
         jira.resources.Issue: newly created Jira issue
     """
     issue = jira.create_issue(fields=fields)
+    if enrichments is None:
+        enrich_issue(jira, issue, ticket)
+    else:
+        enrichments.append((jira, issue, ticket))
+    return issue
 
-    effort = item.get_attribute('effort')
-    if effort:
-        try:
-            issue.update(fields={"timetracking": {"originalEstimate": effort}})
-        except JIRAError:
-            # If effort update fails, append to description instead
-            issue.update(description="{}\n\nEffort estimate: {}".format(item.content, effort))
 
-    for attendee in attendees:
+def enrich_issue(jira, issue, ticket):
+    """ Sets the fields of a newly created Jira issue that need separate calls to Jira.
+
+    The value of the effort option gets added to the Estimated field of the time tracking section. On failure, it gets
+    appended to the description instead.
+    The attendees are added to the watchers field. A warning is raised for each error returned by Jira.
+    The assignee can be set as the last step. When this results in a change in the ticket, the watchers get notified.
+    All calls go through the circuit breaker of the Jira interface object. Once it has tripped, the CircuitOpenError
+    gets raised instead of reported as a warning, so that the remaining calls are skipped.
+
+    Args:
+        jira (jira.JIRA): Jira interface object
+        issue (jira.resources.Issue): Newly created Jira issue
+        ticket (dict): Ticket request with the effort, content, attendees that should get added to the watchers field
+            and the assignee to set as a last and separate call to Jira (empty to skip this step), see build_ticket
+    """
+    effort = ticket['effort']
+    if effort:
+        with track_operation('update_issue'):
+            try:
+                guarded_call(jira, issue.update, fields={"timetracking": {"originalEstimate": effort}})
+            except JIRAError as err:
+                if is_outage_error(err):
+                    raise
+                # If effort update fails, append to description instead
+                guarded_call(jira, issue.update,
+                             description="{}\n\nEffort estimate: {}".format(ticket['content'], effort))
+
+    for attendee in ticket['attendees']:
         try:
             # Let the JIRA library handle user resolution automatically
             jira.add_watcher(issue, attendee)
         except JIRAError as err:
             LOGGER.warning("Could not add watcher {} to issue {}: {}".format(attendee, issue.key, err.text))
+    assignee = ticket['assignee']
     if assignee:
         try:
             # Let the JIRA library handle user resolution automatically
             jira.assign_issue(issue, assignee)
         except JIRAError as err:
             LOGGER.warning("Could not assign issue {} to {}: {}".format(issue.key, assignee, err.text))
-    return issue
+
+
+def enrich_issues(enrichments, workers=1, deadline=None):
+    """ Enriches the given newly created Jira issues, see enrich_issue, after all of them have been created.
+
+    The enrichments are grouped per Jira interface object. Each group is handled by a single thread, so that no Jira
+    interface object, nor its session and circuit breaker, is used by multiple threads at once.
+
+    Issues that cannot be enriched because Jira is unavailable or because the deadline has passed are reported in a
+    single warning.
+
+    Args:
+        enrichments (list): List of tuples with the Jira interface object, the issue and the ticket request
+        workers (int): Maximum number of groups of enrichments to handle concurrently
+        deadline (float/None): Value of time.monotonic() after which no more issues get enriched; None for no deadline
+
+    Returns:
+        list: Enrichments that have been skipped, in the order of the given list
+    """
+    skipped_issues = []
+    deferred_issues = []
+    skipped_enrichments = set()
+
+    def enrich(index, enrichment):
+        jira, issue, ticket = enrichment
+        if deadline is not None and monotonic() >= deadline:
+            deferred_issues.append(issue.key)
+            skipped_enrichments.add(index)
+            return
+        try:
+            enrich_issue(jira, issue, ticket)
+        except SKIPPABLE_ERRORS as err:
+            if not is_skippable_error(err):
+                raise
+            skipped_issues.append(issue.key)
+            skipped_enrichments.add(index)
+
+    def enrich_group(group):
+        for index, enrichment in group:
+            enrich(index, enrichment)
+
+    groups = {}
+    for index, enrichment in enumerate(enrichments):
+        groups.setdefault(id(enrichment[0]), []).append((index, enrichment))
+    workers = min(max(int(workers), 1), len(groups))
+    if workers <= 1:
+        for group in groups.values():
+            enrich_group(group)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(enrich_group, groups.values()))
+    if skipped_issues:
+        LOGGER.warning("Could not set the effort, watchers and assignee of {} Jira issue(s) because Jira is "
+                       "unavailable: {}".format(len(skipped_issues), ', '.join(sorted(skipped_issues))))
+    if deferred_issues:
+        LOGGER.warning("Skipped setting the effort, watchers and assignee of {} Jira issue(s) because of the time "
+                       "budget: {}".format(len(deferred_issues), ', '.join(sorted(deferred_issues))))
+    return [enrichment for index, enrichment in enumerate(enrichments) if index in skipped_enrichments]
+
+
+def enrich_pending_issues(jira, settings, deadline=None):
+    """ Enriches the issues stored in ``pending_enrichments_file`` because a previous run could not enrich them.
+
+    The issues are looked up one by one, so that an issue that has been deleted or moved in the meantime does not
+    affect the others. Issues that cannot be looked up for another reason than Jira being unavailable are dropped with
+    a warning; issues that still cannot be enriched remain in the file.
+
+    Args:
+        jira (jira.JIRA): Jira interface object
+        settings (dict): Configuration for this feature
+        deadline (float/None): Value of time.monotonic() after which no more issues get enriched; None for no deadline
+    """
+    pending_file = settings['pending_enrichments_file']
+    tickets = load_queue(pending_file)
+    if not tickets:
+        return
+    enrichments = []
+    remaining = []
+    for index, ticket in enumerate(tickets):
+        if deadline is not None and monotonic() >= deadline:
+            remaining.extend(tickets[index:])
+            break
+        try:
+            enrichments.append((jira, jira.issue(ticket['issue_key']), ticket))
+        except SKIPPABLE_ERRORS as err:
+            if is_skippable_error(err):
+                LOGGER.warning("Could not enrich the Jira issues in {}: {}"
+                               .format(pending_file, format_jira_error(err)))
+                remaining.extend(tickets[index:])
+                break
+            LOGGER.warning("Dropping Jira issue {} from {}: {}"
+                           .format(ticket['issue_key'], pending_file, format_jira_error(err)))
+    skipped = enrich_issues(enrichments, int(settings.get('enrichment_workers', 0)) or 1, deadline)
+    save_queue(pending_file, [ticket for _, _, ticket in skipped] + remaining)
+
+
+def find_existing_item_ids(jira, item_ids_per_project, item_id_field, batch_size=DEDUP_BATCH_SIZE):
+    """ Finds the item IDs that are already stored in the given field of an existing Jira issue.
+
+    Exact-match JQL is used, which allows to check up to <<batch_size>> item IDs with a single query.
+
+    Args:
+        jira (jira.JIRA): Jira interface object
+        item_ids_per_project (dict): Mapping of Jira project key or id to the list of item IDs to look up
+        item_id_field (str): ID of the Jira field that stores item IDs, e.g. 'labels' or 'customfield_10010'
+        batch_size (int): Maximum number of item IDs to look up per query
+
+    Returns:
+        dict: Mapping of each item ID that already exists in Jira to the key of the issue containing it
+    """
+    existing_issues = {}
+    jql_field = jql_field_name(item_id_field)
+    for project_id_or_key, item_ids in item_ids_per_project.items():
+        for start in range(0, len(item_ids), batch_size):
+            batch = item_ids[start:start + batch_size]
+            values = ', '.join(quote_jql_value(item_id) for item_id in batch)
+            matches = search_jira_issues(
+                jira,
+                "project={} and {} in ({})".format(project_id_or_key, jql_field, values),
+                maxResults=False,
+                fields=item_id_field,
+            )
+            batch_ids = set(batch)
+            for issue in matches or []:
+                field_value = getattr(issue.fields, item_id_field, None) or []
+                if isinstance(field_value, str):
+                    field_value = [field_value]
+                for value in field_value:
+                    if value in batch_ids:
+                        existing_issues.setdefault(value, issue.key)
+    return existing_issues
 
 
 def determine_jira_project(key_regex, key_prefix, default_project, item_id):
@@ -197,43 +828,70 @@ def determine_jira_project(key_regex, key_prefix, default_project, item_id):
         return default_project
 
 
-def get_info_from_relationship(item, config_for_parent, traceability_collection):
-    """ Gets info from the first item with the given relationship.
+def build_parent_index(item_ids, config_for_parent, traceability_collection, user_suffix=''):
+    """ Resolves the parent of each of the given items once.
 
-    Its id is added to the jira field and if it has the 'attendees' attribute, its value is returned as a list.
+    The parent item, the prefix for the jira field and the parsed list of attendees are shared between all items with
+    the same parent.
 
     Args:
-        item (TraceableItem): Traceable item to create the Jira ticket for
-        config_for_parent (str/tuple/list): Relationship to the item to extract info from / tuple or list with
-            relationship as the first element and regex to match ID of parent item as the second element
+        item_ids (list): List of item IDs
+        config_for_parent (str/tuple/list): Relationship to the parent item / tuple or list with relationship as the
+            first element and regex to match ID of parent item as the second element
         traceability_collection (TraceableCollection): Collection of all traceability items
+        user_suffix (str): Suffix to add to each attendee, e.g. '@example.com'; the attendees get lowercased if given
 
     Returns:
-        list: List of attendees (str)
-        str: Contents for field with id jira_field_id
+        dict: Mapping of the ID of each item that has a parent to its ParentInfo
     """
-    attendees = []
-    jira_field = item.caption
-    if config_for_parent:
-        if isinstance(config_for_parent, (tuple, list)):
-            relationship = config_for_parent[0]
-            parent_regex = config_for_parent[1]
-        else:
-            relationship = config_for_parent
-            parent_regex = '.+'
-        parent_ids = item.iter_targets(relationship)
-        parent_id = None
-        for id_ in parent_ids:
-            if match(parent_regex, id_):
-                parent_id = id_
-                break
-        if parent_id:
+    parent_index = {}
+    if not config_for_parent:
+        return parent_index
+    relationship, parent_regex = parse_config_for_parent(config_for_parent)
+    parent_pattern = compile_regex(parent_regex)
+    parents = {}
+    for item_id in item_ids:
+        item = traceability_collection.get_item(item_id)
+        parent_id = next((id_ for id_ in item.iter_targets(relationship) if parent_pattern.match(id_)), None)
+        if not parent_id:
+            continue
+        if parent_id not in parents:
             parent = traceability_collection.get_item(parent_id)
-            jira_field = "{id}: {field}".format(id=parent_id, field=jira_field)  # prepend item ID of parent
-            attr_value = parent.get_attribute('attendees')
-            if attr_value:
-                attendees.extend((val.strip() for val in attr_value.split(',')))
-    return attendees, jira_field
+            attr_value = parent.get_attribute('attendees') if parent is not None else ''
+            attendees = tuple(val.strip() for val in attr_value.split(',')) if attr_value else ()
+            if user_suffix:
+                attendees = tuple(f"{attendee}{user_suffix}".lower() for attendee in attendees)
+            parents[parent_id] = ParentInfo(parent_id, parent, "{}: ".format(parent_id), attendees)
+        parent_index[item_id] = parents[parent_id]
+    return parent_index
+
+
+def parse_config_for_parent(config_for_parent):
+    """ Splits the configuration for the parent item in the relationship and the regex to match the ID of the parent.
+
+    Args:
+        config_for_parent (str/tuple/list): Relationship to the parent item / tuple or list with relationship as the
+            first element and regex to match ID of parent item as the second element
+
+    Returns:
+        str: Relationship to the parent item
+        str: Regular expression to match the ID of the parent item
+    """
+    if isinstance(config_for_parent, (tuple, list)):
+        return config_for_parent[0], config_for_parent[1]
+    return config_for_parent, '.+'
+
+
+def quote_jql_value(value):
+    """ Quotes a value to be used as an exact-match operand in a JQL query.
+
+    Args:
+        value (str): Value to quote
+
+    Returns:
+        str: Value enclosed in double quotes, with backslashes and double quotes escaped
+    """
+    return '"{}"'.format(value.replace('\\', '\\\\').replace('"', '\\"'))
 
 
 def escape_special_characters(input_string):
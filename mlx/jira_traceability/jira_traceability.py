@@ -1,6 +1,6 @@
-from sphinx.util.logging import getLogger
+from os import path
 
-from .jira_interaction import create_jira_issues
+from sphinx.util.logging import getLogger
 
 try:
     from ._version import __version__
@@ -13,11 +13,28 @@ LOGGER = getLogger('mlx.jira_traceability')
 def jira_interaction(app):
     """ Execute the functionality that creates Jira tickets based on traceable items.
 
+    If ``traceability_jira_profile_output`` or the ``profile_output`` setting is configured, the Jira phase gets
+    profiled and the results are stored in a file with that name in the output directory.
+
+    The Jira library and its dependencies only get imported here, so that builds without Jira automation don't pay
+    for importing them.
+
     Args:
         app: Sphinx application object to use.
     """
+    from .jira_interaction import create_jira_issues  # pylint: disable=import-outside-toplevel
+
+    settings = app.config.traceability_jira_automation
+    profile_output = app.config.traceability_jira_profile_output or settings.get('profile_output', '')
     try:
-        create_jira_issues(app.config.traceability_jira_automation, app.builder.env.traceability_collection)
+        if profile_output:
+            from .profiling import JiraProfiler  # pylint: disable=import-outside-toplevel
+            profile_path = path.join(app.outdir, profile_output)
+            with JiraProfiler(profile_path):
+                create_jira_issues(settings, app.builder.env.traceability_collection, max(app.parallel, 1))
+            LOGGER.info("Profile of the Jira phase stored in %s", profile_path)
+        else:
+            create_jira_issues(settings, app.builder.env.traceability_collection, max(app.parallel, 1))
     except Exception as err:  # pylint: disable=broad-except
         if app.config.traceability_jira_automation.get('errors_to_warnings', True):
             LOGGER.warning("Jira interaction failed: %s", str(err))
@@ -36,6 +53,8 @@ def perform_consistency_check(app, env):
 def setup(app):
     # Configuration for automated issue creation in JIRA
     app.add_config_value('traceability_jira_automation', {}, 'env')
+    # File in the output directory to store a profile of the Jira phase in; can be set with -D on the command line
+    app.add_config_value('traceability_jira_profile_output', '', '')
 
     app.connect('env-check-consistency', perform_consistency_check)
 
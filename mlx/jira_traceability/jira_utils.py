@@ -1,4 +1,6 @@
 """Utility functions for JIRA error handling and formatting"""
+import json
+import os
 
 from jira import JIRAError
 from sphinx.util.logging import getLogger
@@ -30,6 +32,32 @@ def format_jira_error(err):
         return f"Error: {str(err)}"
 
 
+def search_jira_issues(jira, jql_str, **kwargs):
+    """Search Jira issues, using enhanced_search_issues for Jira Cloud compatibility.
+
+    Falls back to the legacy search_issues for older jira library versions.
+
+    Args:
+        jira: Jira interface object
+        jql_str (str): JQL query to execute
+        **kwargs: Additional keyword arguments for the search method, e.g. maxResults
+
+    Returns:
+        list: Matching issues
+    """
+    try:
+        return jira.enhanced_search_issues(jql_str=jql_str, **kwargs)
+    except AttributeError:
+        return jira.search_issues(jql_str=jql_str, **kwargs)
+
+
+def jql_field_name(field_id):
+    """Convert a Jira field ID to the name to use for it in JQL, e.g. 'customfield_10010' becomes 'cf[10010]'."""
+    if field_id.startswith('customfield_'):
+        return f"cf[{field_id[len('customfield_'):]}]"
+    return field_id
+
+
 def validate_components(jira, project_id_or_key, components):
     """Validate a list of components against a Jira project's available components.
 
@@ -66,3 +94,40 @@ def validate_components(jira, project_id_or_key, components):
     except JIRAError as err:
         LOGGER.warning(f"Failed to validate components: {err.text}")
         return components  # Return original components if validation fails
+
+
+def load_item_ids(path):
+    """Load the list of item IDs stored in the given JSON file.
+
+    Args:
+        path (str): Path to the JSON file
+
+    Returns:
+        list: List of item IDs; empty if the file does not exist or cannot be parsed
+    """
+    try:
+        with open(path, encoding='utf-8') as file:
+            return [str(item_id) for item_id in json.load(file)]
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError, TypeError) as err:
+        LOGGER.warning(f"Failed to load item IDs from {path}: {err}")
+        return []
+
+
+def save_item_ids(path, item_ids):
+    """Store the given list of item IDs in a JSON file; the file gets removed when the list is empty.
+
+    Args:
+        path (str): Path to the JSON file
+        item_ids (list): List of item IDs to store
+    """
+    if not item_ids:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(item_ids, file, indent=2)
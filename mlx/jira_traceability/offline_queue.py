@@ -0,0 +1,111 @@
+"""Durable local queue of requests to create Jira tickets, used while Jira is unreachable
+
+The queue can be flushed by the next build that can reach Jira or by running this module::
+
+    python -m mlx.jira_traceability.offline_queue path/to/directory/with/conf.py
+"""
+import json
+import os
+import sys
+from argparse import ArgumentParser
+
+from sphinx.util.logging import getLogger
+
+LOGGER = getLogger('mlx.jira_traceability')
+
+
+def load_queue(path):
+    """ Loads the ticket requests stored in the given queue file.
+
+    Args:
+        path (str): Path to the queue file, in JSON Lines format
+
+    Returns:
+        list: List of ticket requests; empty if the file does not exist
+    """
+    tickets = []
+    try:
+        with open(path, encoding='utf-8') as file:
+            for line_nr, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    tickets.append(json.loads(line))
+                except ValueError as err:
+                    LOGGER.warning("Ignoring invalid line {} in offline queue {}: {}".format(line_nr, path, err))
+    except FileNotFoundError:
+        pass
+    return tickets
+
+
+def save_queue(path, tickets):
+    """ Replaces the content of the given queue file by the given ticket requests.
+
+    The file gets written atomically and is removed when there are no ticket requests left.
+
+    Args:
+        path (str): Path to the queue file, in JSON Lines format
+        tickets (list): List of ticket requests
+    """
+    if not tickets:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        for ticket in tickets:
+            file.write(json.dumps(ticket) + '\n')
+    os.replace(tmp_path, path)
+
+
+def enqueue_tickets(path, tickets):
+    """ Adds the given ticket requests to the queue file.
+
+    A request that has been queued before for the same item gets replaced by the new one.
+
+    Args:
+        path (str): Path to the queue file, in JSON Lines format
+        tickets (list): List of ticket requests to add
+    """
+    queued = {ticket['item_id']: ticket for ticket in load_queue(path)}
+    for ticket in tickets:
+        queued.pop(ticket['item_id'], None)
+        queued[ticket['item_id']] = ticket
+    save_queue(path, list(queued.values()))
+
+
+def main(argv=None):
+    """ Flushes the offline queue configured in the ``traceability_jira_automation`` setting of a Sphinx project.
+
+    Args:
+        argv (list): Command line arguments; None to use sys.argv
+
+    Returns:
+        int: Exit code; 1 if tickets remain in the queue, 0 otherwise
+    """
+    from sphinx.config import Config  # pylint: disable=import-outside-toplevel
+
+    from .jira_interaction import connect_to_jira, flush_offline_queue  # pylint: disable=import-outside-toplevel
+
+    parser = ArgumentParser(description=main.__doc__.splitlines()[0])
+    parser.add_argument('confdir', help="Directory containing the conf.py of the Sphinx project")
+    parser.add_argument('-w', '--workers', type=int, help="Number of tickets to create concurrently")
+    args = parser.parse_args(argv)
+
+    config = Config.read(os.path.abspath(args.confdir))
+    settings = dict(config._raw_config.get('traceability_jira_automation', {}))  # pylint: disable=protected-access
+    if not settings.get('offline_queue_file'):
+        parser.error("traceability_jira_automation does not configure an offline_queue_file")
+    if args.workers:
+        settings['flush_workers'] = args.workers
+    created_issues, _ = flush_offline_queue(connect_to_jira(settings), settings)
+    print("mlx.jira-traceability: created {} Jira ticket(s) from {}"
+          .format(len(created_issues), settings['offline_queue_file']))
+    return 1 if load_queue(settings['offline_queue_file']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Profiling of the Jira phase, splitting the time spent per Jira operation in local work and network wait"""
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+from requests.adapters import HTTPAdapter
+
+_ACTIVE_PROFILER = None
+
+
+def track_operation(name):
+    """ Returns a context manager that attributes the time spent in it to the Jira operation with the given name.
+
+    Args:
+        name (str): Name of the Jira operation
+
+    Returns:
+        contextmanager: Context manager that does nothing when no profiler is active
+    """
+    if _ACTIVE_PROFILER is None:
+        return nullcontext()
+    return _ACTIVE_PROFILER.track(name)
+
+
+def wrap_client(jira):
+    """ Wraps the given Jira interface object so that each call gets tracked as a Jira operation by the profiler.
+
+    Args:
+        jira (jira.JIRA): Jira interface object
+
+    Returns:
+        jira.JIRA/ProfiledJira: The Jira interface object itself when no profiler is active; a tracking proxy otherwise
+    """
+    if _ACTIVE_PROFILER is None:
+        return jira
+    return ProfiledJira(jira, _ACTIVE_PROFILER)
+
+
+class ProfiledJira:
+    """ Proxy for a Jira interface object that tracks each call as a Jira operation """
+
+    def __init__(self, jira, profiler):
+        self._jira = jira
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        attribute = getattr(self._jira, name)
+        if not callable(attribute):
+            return attribute
+
+        def tracked_call(*args, **kwargs):
+            with self._profiler.track(name):
+                return attribute(*args, **kwargs)
+
+        return tracked_call
+
+
+class JiraProfiler:
+    """ Context manager that profiles the Jira phase of the build.
+
+    The cProfile statistics of the main thread and of the threads it starts, e.g. the workers that create the Jira
+    tickets, get merged and stored in the output file. A report gets stored next to it, with the
+    suffix ``.txt``, which splits the wall-clock time of each Jira operation in network wait, i.e. time spent waiting
+    for HTTP responses, and local time spent in the jira library. Time spent outside of Jira operations is reported as
+    time spent in the plugin.
+    """
+
+    def __init__(self, output_path):
+        """ Constructor
+
+        Args:
+            output_path (str): Path of the file to store the cProfile statistics in
+        """
+        self.output_path = output_path
+        self.report_path = output_path + '.txt'
+        self.operations = {}
+        self.unattributed_network = 0.0
+        self.total_time = 0.0
+        self._profile = cProfile.Profile()
+        self._thread_profiles = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._original_send = None
+        self._start = None
+
+    def __enter__(self):
+        global _ACTIVE_PROFILER  # pylint: disable=global-statement
+        profiler = self
+        original_send = self._original_send = HTTPAdapter.send
+
+        def timed_send(adapter, *args, **kwargs):
+            start = perf_counter()
+            try:
+                return original_send(adapter, *args, **kwargs)
+            finally:
+                profiler.add_network_time(perf_counter() - start)
+
+        HTTPAdapter.send = timed_send
+        _ACTIVE_PROFILER = self
+        self._start = perf_counter()
+        threading.setprofile(self._profile_thread)
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *_):
+        global _ACTIVE_PROFILER  # pylint: disable=global-statement
+        self._profile.disable()
+        threading.setprofile(None)
+        self.total_time = perf_counter() - self._start
+        _ACTIVE_PROFILER = None
+        HTTPAdapter.send = self._original_send
+        directory = os.path.dirname(self.output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        stats = pstats.Stats(self._profile)
+        with self._lock:
+            for profile in self._thread_profiles:
+                stats.add(profile)
+        stats.dump_stats(self.output_path)
+        with open(self.report_path, 'w', encoding='utf-8') as report:
+            report.write(self.report())
+
+    def _profile_thread(self, *_):
+        """ Starts profiling the thread that calls this profile function, which threading installs in new threads """
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return  # since Python 3.12, the profile of the main thread covers all threads already
+        with self._lock:
+            self._thread_profiles.append(profile)
+
+    def add_network_time(self, duration):
+        """ Adds the given time spent waiting for an HTTP response to the Jira operation of the current thread """
+        if getattr(self._local, 'network', None) is not None:
+            self._local.network += duration
+        else:
+            with self._lock:
+                self.unattributed_network += duration
+
+    @contextmanager
+    def track(self, name):
+        """ Attributes the time spent in this context to the Jira operation with the given name.
+
+        Nested operations are attributed to the outermost one.
+
+        Args:
+            name (str): Name of the Jira operation
+        """
+        if getattr(self._local, 'network', None) is not None:
+            yield
+            return
+        self._local.network = 0.0
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            wall = perf_counter() - start
+            network = self._local.network
+            self._local.network = None
+            with self._lock:
+                calls, total_wall, total_network = self.operations.get(name, (0, 0.0, 0.0))
+                self.operations[name] = (calls + 1, total_wall + wall, total_network + network)
+
+    def report(self):
+        """ Returns the report of the time spent per Jira operation as a string """
+        lines = ["{:<28} {:>7} {:>12} {:>12} {:>12}".format('operation', 'calls', 'wall [s]', 'network [s]',
+                                                            'local [s]')]
+        operations_wall = 0.0
+        for name, (calls, wall, network) in sorted(self.operations.items(), key=lambda op: op[1][1], reverse=True):
+            operations_wall += wall
+            lines.append("{:<28} {:>7} {:>12.3f} {:>12.3f} {:>12.3f}".format(name, calls, wall, network,
+                                                                             wall - network))
+        lines.append('')
+        lines.append("Total time of the Jira phase: {:.3f} s".format(self.total_time))
+        lines.append("Time spent in Jira operations: {:.3f} s".format(operations_wall))
+        lines.append("Time spent in the plugin outside of Jira operations: {:.3f} s"
+                     .format(max(self.total_time - operations_wall, 0.0)))
+        lines.append("Network wait outside of Jira operations, e.g. issue updates: {:.3f} s"
+                     .format(self.unattributed_network))
+        return '\n'.join(lines) + '\n'
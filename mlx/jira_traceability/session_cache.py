@@ -0,0 +1,126 @@
+"""On-disk cache of the cookies of an authenticated Jira session, reused across builds to skip the login handshake"""
+import json
+import os
+import threading
+from time import time
+
+from jira import JIRAError
+from requests.cookies import RequestsCookieJar, create_cookie
+from sphinx.util.logging import getLogger
+
+LOGGER = getLogger('mlx.jira_traceability')
+SESSION_CACHE_TTL = 3600
+
+_SAVE_LOCK = threading.Lock()
+
+
+class SessionCache:
+    """ Cache of the session cookies that Jira, or the single sign-on server in front of it, issued to a user.
+
+    The cookies are stored with an expiry time and are only reused for the same server and user. A reused session
+    authenticates with its cookies only. When Jira rejects it with status code 401, the cookies are dropped and the
+    request is sent again with the credentials. The expiry time is set when a session is started with the credentials
+    and is kept while the session gets reused.
+    """
+
+    def __init__(self, path, server, username, ttl=SESSION_CACHE_TTL):
+        """ Constructor
+
+        Args:
+            path (str): Path to the JSON file to store the session cookies in
+            server (str): URL of the Jira server
+            username (str): Name of the user that the session belongs to
+            ttl (float): Number of seconds during which stored session cookies get reused
+        """
+        self.path = path
+        self.server = server
+        self.username = username
+        self.ttl = ttl
+        self.expires = None
+
+    def load(self):
+        """ Loads the stored session cookies if they belong to the same server and user and have not expired.
+
+        Returns:
+            RequestsCookieJar/None: Session cookies; None if there are no cookies to reuse
+        """
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                entry = json.load(file)
+            if (entry.get('server'), entry.get('username')) != (self.server, self.username):
+                return None
+            expires = float(entry['expires'])
+            if expires <= time():
+                return None
+            cookies = RequestsCookieJar()
+            for attributes in entry['cookies']:
+                cookie = create_cookie(**attributes)
+                if not cookie.is_expired():
+                    cookies.set_cookie(cookie)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as err:
+            LOGGER.warning("Ignoring invalid Jira session cache {}: {}".format(self.path, err))
+            return None
+        self.expires = expires
+        return cookies or None
+
+    def save(self, cookies, expires=None):
+        """ Stores the given session cookies atomically, readable by the current user only.
+
+        Args:
+            cookies (http.cookiejar.CookieJar): Cookies of the session
+            expires (float/None): Time after which the cookies may no longer be reused; None to apply the TTL
+        """
+        entry = {
+            'server': self.server,
+            'username': self.username,
+            'expires': expires or time() + self.ttl,
+            'cookies': [{'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path,
+                         'secure': cookie.secure, 'expires': cookie.expires} for cookie in cookies],
+        }
+        if not entry['cookies']:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with _SAVE_LOCK:
+            with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w', encoding='utf-8') as file:
+                json.dump(entry, file)
+            os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """ Removes the stored session cookies """
+        with _SAVE_LOCK:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def install(self, session, credentials=None):
+        """ Stores the cookies of the given session and makes it log in again when a reused session gets rejected.
+
+        Args:
+            session (requests.Session): Session of the Jira interface object
+            credentials (tuple/None): User name and password to log in with when the session gets rejected; None if
+                the session has been started with the credentials rather than with cookies loaded from the cache
+        """
+        self.save(session.cookies, self.expires if credentials else None)
+        original_request = session.request
+        state = {'reused': credentials is not None}
+
+        def reauthenticating_request(method, url, **kwargs):
+            try:
+                return original_request(method, url, **kwargs)
+            except JIRAError as err:
+                if err.status_code != 401 or not state['reused']:
+                    raise
+            state['reused'] = False
+            LOGGER.info("Jira rejected the cached session; logging in again")
+            session.cookies.clear()
+            session.auth = credentials
+            self.clear()
+            response = original_request(method, url, **kwargs)
+            self.save(session.cookies)
+            return response
+
+        session.request = reauthenticating_request
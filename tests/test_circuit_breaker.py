@@ -0,0 +1,73 @@
+from unittest import TestCase, mock
+
+from jira import JIRAError
+from requests.exceptions import ConnectionError as RequestsConnectionError
+
+from mlx.jira_traceability.circuit_breaker import (CircuitBreaker, CircuitOpenError, guarded_call, is_outage_error,
+                                                   is_skippable_error)
+
+
+class TestCircuitBreaker(TestCase):
+    def test_is_outage_error(self):
+        self.assertTrue(is_outage_error(RequestsConnectionError('refused')))
+        self.assertTrue(is_outage_error(JIRAError(status_code=401)))
+        self.assertTrue(is_outage_error(JIRAError(status_code=403)))
+        self.assertTrue(is_outage_error(JIRAError(status_code=503)))
+        self.assertFalse(is_outage_error(JIRAError(status_code=400)))
+        self.assertFalse(is_outage_error(ValueError('not a Jira error')))
+
+    def test_is_outage_error_chained(self):
+        """ A JIRAError without status code is classified by the error that caused it """
+        for cause, expected in ((RequestsConnectionError('refused'), True), (JIRAError(status_code=503), True),
+                                (JIRAError(status_code=404), False), (KeyError('name'), False)):
+            try:
+                try:
+                    raise cause
+                except Exception as err:
+                    raise JIRAError(str(err))
+            except JIRAError as err:
+                self.assertEqual(is_outage_error(err), expected, cause)
+        self.assertFalse(is_outage_error(JIRAError('No matching user found')))
+
+    def test_is_skippable_error(self):
+        self.assertTrue(is_skippable_error(CircuitOpenError('tripped')))
+        self.assertTrue(is_skippable_error(JIRAError(status_code=502)))
+        self.assertFalse(is_skippable_error(JIRAError(status_code=400)))
+
+    def test_guarded_call(self):
+        """ Calls on objects returned by Jira, e.g. issue updates, can be guarded by the circuit breaker """
+        breaker = CircuitBreaker(mock.MagicMock(), 1)
+        update = mock.MagicMock(side_effect=RequestsConnectionError('refused'))
+
+        with self.assertRaises(RequestsConnectionError):
+            guarded_call(breaker, update, description='text')
+        with self.assertRaises(CircuitOpenError):
+            guarded_call(breaker, update, description='text')
+        self.assertEqual(update.call_count, 1)
+        self.assertEqual(guarded_call(mock.MagicMock(), lambda value: value * 2, 21), 42)
+
+    def test_trips_after_consecutive_failures(self):
+        jira_mock = mock.MagicMock()
+        jira_mock.create_issue.side_effect = JIRAError(status_code=503, text='Service unavailable')
+        breaker = CircuitBreaker(jira_mock, 2)
+
+        for _ in range(2):
+            with self.assertRaises(JIRAError):
+                breaker.create_issue(fields={})
+        self.assertTrue(breaker.is_open)
+        with self.assertRaisesRegex(CircuitOpenError, 'after 2 consecutive failures.*Service unavailable'):
+            breaker.search_issues(jql_str='project=ABC')
+        self.assertEqual(jira_mock.create_issue.call_count, 2)
+        jira_mock.search_issues.assert_not_called()
+
+    def test_success_resets_failure_count(self):
+        jira_mock = mock.MagicMock()
+        jira_mock.create_issue.side_effect = [RequestsConnectionError('refused'), 'issue', JIRAError(status_code=401)]
+        breaker = CircuitBreaker(jira_mock, 2)
+
+        with self.assertRaises(RequestsConnectionError):
+            breaker.create_issue(fields={})
+        self.assertEqual(breaker.create_issue(fields={}), 'issue')
+        with self.assertRaises(JIRAError):
+            breaker.create_issue(fields={})
+        self.assertFalse(breaker.is_open)
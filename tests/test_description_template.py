@@ -0,0 +1,42 @@
+from unittest import TestCase
+
+from mlx.traceability import TraceableAttribute, TraceableItem
+
+from mlx.jira_traceability.description_template import DescriptionTemplate
+
+
+class TestDescriptionTemplate(TestCase):
+    def setUp(self):
+        TraceableItem.define_attribute(TraceableAttribute('assignee', '^.*$'))
+        self.parent = TraceableItem('MEETING-12345_2')
+        self.parent.caption = 'Weekly meeting'
+        self.item = TraceableItem('ACTION-12345_ACTION_1')
+        self.item.docname = 'meetings/2024'
+        self.item.add_attribute('assignee', 'ABC')
+
+    def test_no_placeholders(self):
+        template = DescriptionTemplate('Head\n\n', {})
+        self.assertEqual(template.render(self.item, 'Body'), 'Head\n\nBody')
+
+    def test_item_and_parent_placeholders(self):
+        """ Placeholders can refer to Python attributes, traceable attributes and attributes of the parent """
+        template = DescriptionTemplate('[<<caption>>|<<doc>>.html] <<doc>> for <<who>>\n',
+                                       {'<<doc>>': 'docname', '<<who>>': 'assignee', '<<caption>>': 'parent.caption'})
+        self.assertFalse(template.head_is_shared)
+        self.assertEqual(template.render(self.item, 'Body of <<who>>', self.parent),
+                         '[Weekly meeting|meetings/2024.html] meetings/2024 for ABC\nBody of ABC')
+        self.assertEqual(template.render(self.item, '', None), '[|meetings/2024.html] meetings/2024 for ABC\n')
+
+    def test_longest_placeholder_first(self):
+        template = DescriptionTemplate('<<id>> <<id_long>>', {'<<id>>': 'identifier', '<<id_long>>': 'docname'})
+        self.assertEqual(template.render(self.item, ''), 'ACTION-12345_ACTION_1 meetings/2024')
+
+    def test_shared_head_is_cached(self):
+        """ A head that only depends on the document name and the parent is rendered once per combination """
+        template = DescriptionTemplate('<<file_name>>: ', {'<<file_name>>': 'docname'})
+        self.assertTrue(template.head_is_shared)
+        self.assertEqual(template.render(self.item, 'Body'), 'meetings/2024: Body')
+        self.item.docname = 'meetings/2025'
+        self.assertEqual(template.render(self.item, 'Body'), 'meetings/2025: Body')
+        self.assertEqual(template.render(self.item, 'Body', self.parent), 'meetings/2025: Body')
+        self.assertEqual(len(template._head_cache), 3)
@@ -0,0 +1,75 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from requests import Response
+
+from mlx.jira_traceability.http_cache import MetadataCache
+
+COMPONENTS_URL = 'https://jira.example.com/rest/api/2/project/MLX12345/components'
+
+
+def make_response(status_code, content=b'', headers=None):
+    response = Response()
+    response.status_code = status_code
+    response.url = COMPONENTS_URL
+    response.headers.update(headers or {})
+    response._content = content
+    return response
+
+
+class TestMetadataCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmp_dir.name, 'jira_metadata.json')
+        self.session = mock.MagicMock()
+        self.send = self.session.request
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_is_cacheable(self):
+        self.assertTrue(MetadataCache.is_cacheable('GET', COMPONENTS_URL))
+        self.assertTrue(MetadataCache.is_cacheable('get', 'https://jira.example.com/rest/api/2/user/search'))
+        self.assertFalse(MetadataCache.is_cacheable('POST', COMPONENTS_URL))
+        self.assertFalse(MetadataCache.is_cacheable('GET', 'https://jira.example.com/rest/api/2/search'))
+        self.assertFalse(MetadataCache.is_cacheable('GET', 'https://jira.example.com/rest/api/2/issue/X-1/watchers'))
+
+    def test_served_from_disk_within_ttl(self):
+        """ A response stored by one build is served without a request by the next one """
+        self.send.return_value = make_response(200, b'[{"name": "SW"}]', {'Content-Type': 'application/json'})
+        MetadataCache(self.cache_file, ttl=60).install(self.session)
+        self.assertEqual(self.session.request('GET', COMPONENTS_URL).json(), [{'name': 'SW'}])
+
+        next_session = mock.MagicMock()
+        next_send = next_session.request
+        MetadataCache(self.cache_file, ttl=60).install(next_session)
+        self.assertEqual(next_session.request('GET', COMPONENTS_URL).json(), [{'name': 'SW'}])
+        self.assertEqual(self.send.call_count, 1)
+        next_send.assert_not_called()
+
+    def test_revalidation_with_etag(self):
+        """ An expired response gets revalidated with a conditional request """
+        self.send.side_effect = [
+            make_response(200, b'[{"name": "SW"}]', {'ETag': '"v1"'}),
+            make_response(304),
+        ]
+        cache = MetadataCache(self.cache_file, ttl=0)
+        cache.install(self.session)
+        self.session.request('GET', COMPONENTS_URL)
+        response = self.session.request('GET', COMPONENTS_URL, headers={'Accept': 'application/json'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [{'name': 'SW'}])
+        self.assertEqual(self.send.call_args.kwargs['headers'],
+                         {'Accept': 'application/json', 'If-None-Match': '"v1"'})
+
+    def test_errors_and_other_requests_not_cached(self):
+        self.send.side_effect = [make_response(404), make_response(404), make_response(201)]
+        MetadataCache(self.cache_file).install(self.session)
+        self.session.request('GET', COMPONENTS_URL)
+        self.session.request('GET', COMPONENTS_URL)
+        self.session.request('POST', COMPONENTS_URL, data='{}')
+
+        self.assertEqual(self.send.call_count, 3)
+        self.assertFalse(os.path.exists(self.cache_file))
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+HEAVY_MODULES = ('jira', 'requests', 'requests_oauthlib', 'defusedxml')
+RUNS = 3
+# loading the extension may take at most this much longer than importing the logging of Sphinx, which it needs anyway
+MAX_IMPORT_TIME_RATIO = 2.0
+
+
+def import_timings(module):
+    """ Imports the given module in a fresh interpreter and returns the cumulative import time (us) per module """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+                            capture_output=True, text=True, check=True)
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def best_import_time(module):
+    """ Returns the lowest cumulative import time (us) of the given module over a number of fresh interpreters """
+    return min(import_timings(module)[module] for _ in range(RUNS))
+
+
+class TestImportTime(TestCase):
+    def test_no_heavy_imports_at_load_time(self):
+        """ Loading the extension must not import the Jira library or its dependency tree """
+        timings = import_timings('mlx.jira_traceability')
+        self.assertIn('mlx.jira_traceability', timings)
+        heavy = sorted(name for name in timings if name.split('.')[0] in HEAVY_MODULES)
+        self.assertEqual(heavy, [])
+
+    def test_import_time_budget(self):
+        """ Loading the extension costs little more than importing the logging of Sphinx """
+        extension_time = best_import_time('mlx.jira_traceability')
+        baseline_time = best_import_time('sphinx.util.logging')
+        self.assertLess(extension_time, MAX_IMPORT_TIME_RATIO * baseline_time,
+                        "importing mlx.jira_traceability took {:.1f} ms, sphinx.util.logging {:.1f} ms"
+                        .format(extension_time / 1000, baseline_time / 1000))
@@ -1,11 +1,18 @@
+import json
+import os
+import threading
 from collections import namedtuple
 from logging import WARNING, warning
+from tempfile import TemporaryDirectory
 from unittest import TestCase, mock
 
 from jira import JIRAError
+from requests.cookies import cookiejar_from_dict
+from requests.exceptions import ConnectionError as RequestsConnectionError
 
 from mlx.traceability import TraceableAttribute, TraceableCollection, TraceableItem
 import mlx.jira_traceability.jira_interaction as dut
+from mlx.jira_traceability.offline_queue import load_queue
 
 
 
@@ -393,31 +400,35 @@ class TestJiraInteraction(TestCase):
                 mock.call(fields=expected_fields_2),
             ])
 
-    def test_get_info_from_relationship_tuple(self, _):
-        """ Tests dut.get_info_from_relationship with a config_for_parent parameter as tuple """
+    def build_ticket_with_parent(self, item_id, relationship_to_parent):
+        """ Builds the ticket request for the given item, with its parent resolved by dut.build_parent_index """
+        parent_index = dut.build_parent_index([item_id], relationship_to_parent, self.coll)
+        return dut.build_ticket(item_id, {}, self.settings, self.coll, dut.DescriptionTemplate('', {}),
+                                parent_index.get(item_id))
+
+    def test_parent_with_config_tuple(self, _):
+        """ Tests resolving the parent with a config_for_parent parameter as tuple """
         relationship_to_parent = ('depends_on', r'ZZZ-[\w_]+')
         alternative_parent = TraceableItem('ZZZ-TO_BE_PRIORITIZED')
         # to be prioritized over MEETING-12345_2
         self.coll.add_relation('ACTION-12345_ACTION_1', 'depends_on', alternative_parent.identifier)
-        action1 = self.coll.get_item('ACTION-12345_ACTION_1')
 
-        attendees, jira_field = dut.get_info_from_relationship(action1, relationship_to_parent, self.coll)
+        ticket = self.build_ticket_with_parent('ACTION-12345_ACTION_1', relationship_to_parent)
 
-        self.assertEqual(attendees, [])
-        self.assertEqual(jira_field, 'ZZZ-TO_BE_PRIORITIZED: Action 1\'s caption?')
+        self.assertEqual(ticket['attendees'], ())
+        self.assertEqual(ticket['fields']['summary'], 'ZZZ-TO_BE_PRIORITIZED: Action 1\'s caption?')
 
-    def test_get_info_from_relationship_str(self, _):
-        """ Tests dut.get_info_from_relationship with a config_for_parent parameter as str """
+    def test_parent_with_config_str(self, _):
+        """ Tests resolving the parent with a config_for_parent parameter as str """
         relationship_to_parent = 'depends_on'
         alternative_parent = TraceableItem('ZZZ-TO_BE_IGNORED')
         # not to be prioritized over MEETING-12345_2 (natural sorting)
         self.coll.add_relation('ACTION-12345_ACTION_1', 'depends_on', alternative_parent.identifier)
-        action1 = self.coll.get_item('ACTION-12345_ACTION_1')
 
-        attendees, jira_field = dut.get_info_from_relationship(action1, relationship_to_parent, self.coll)
+        ticket = self.build_ticket_with_parent('ACTION-12345_ACTION_1', relationship_to_parent)
 
-        self.assertEqual(attendees, ['ABC', 'ZZZ'])
-        self.assertEqual(jira_field, 'MEETING-12345_2: Action 1\'s caption?')
+        self.assertEqual(ticket['attendees'], ('ABC', 'ZZZ'))
+        self.assertEqual(ticket['fields']['summary'], 'MEETING-12345_2: Action 1\'s caption?')
 
     def test_component_stripping(self, jira):
         """ Test that component names get stripped of square brackets when the original doesn't exist """
@@ -571,3 +582,506 @@ class TestJiraInteraction(TestCase):
                                  maxResults=1),
                              mock.call(jql_str="project=MLX12345 and summary ~ 'Caption for action 2'", maxResults=1),
                          ])
+
+    def test_item_id_field_exact_match(self, jira):
+        """ Item IDs get stored in ``item_id_field`` and duplicates are detected with a batched exact-match query """
+        self.settings['item_id_field'] = 'labels'
+        self.settings['item_id_search_fallback'] = False
+        existing_issue = mock.MagicMock(key='MLX12345-1')
+        existing_issue.fields.labels = ['ACTION-12345_ACTION_1', 'unrelated']
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = [existing_issue]
+        jira_mock.project_components.return_value = produce_fake_components()
+
+        with self.assertLogs(level=WARNING) as cm:
+            dut.create_jira_issues(self.settings, self.coll)
+
+        self.assertEqual(
+            cm.output,
+            ["WARNING:sphinx.mlx.jira_traceability:Won't create a Task for item 'ACTION-12345_ACTION_1' because "
+             "Jira issue MLX12345-1 already has this item ID in field 'labels'"]
+        )
+        self.assertEqual(jira_mock.enhanced_search_issues.call_args_list,
+                         [
+                             mock.call(jql_str='project=MLX12345 and labels in ("ACTION-12345_ACTION_1", '
+                                               '"ACTION-12345_ACTION_2")',
+                                       maxResults=False,
+                                       fields='labels'),
+                         ])
+        self.assertEqual(
+            jira_mock.create_issue.call_args_list,
+            [
+                mock.call(fields={
+                    'project': {'key': 'MLX12345'},
+                    'summary': 'Caption for action 2',
+                    'labels': ['ACTION-12345_ACTION_2'],
+                    'description': 'Caption for action 2',
+                    'assignee': {'name': 'ZZZ'},
+                    'components': [{'name': '[SW]'}, {'name': '[HW]'}],
+                    'issuetype': {'name': 'Task'},
+                }),
+            ])
+
+    def test_item_id_field_search_fallback(self, jira):
+        """ Items not found by their ID are looked up by summary, to find tickets created before ``item_id_field`` """
+        self.settings['item_id_field'] = 'labels'
+        legacy_issue = mock.MagicMock(key='MLX12345-1')
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.side_effect = lambda jql_str, **_: [] if ' in (' in jql_str else [legacy_issue]
+        jira_mock.project_components.return_value = produce_fake_components()
+
+        dut.create_jira_issues(self.settings, self.coll)
+
+        self.assertEqual(
+            [call.kwargs['jql_str'] for call in jira_mock.enhanced_search_issues.call_args_list],
+            [
+                'project=MLX12345 and labels in ("ACTION-12345_ACTION_1", "ACTION-12345_ACTION_2")',
+                'project=MLX12345 and summary ~ "MEETING\\\\-12345_2\\\\: Action 1\'s caption\\\\?"',
+                "project=MLX12345 and summary ~ 'Caption for action 2'",
+            ])
+        jira_mock.create_issue.assert_not_called()
+
+    def test_find_existing_item_ids_batches(self, jira):
+        """ Exact-match queries are split in batches and custom fields are referenced with their cf[] notation """
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = []
+        item_ids = ['ID_{}'.format(nr) for nr in range(5)]
+
+        existing = dut.find_existing_item_ids(jira_mock, {'MLX12345': item_ids}, 'customfield_10010', batch_size=2)
+
+        self.assertEqual(existing, {})
+        self.assertEqual(
+            [call.kwargs['jql_str'] for call in jira_mock.enhanced_search_issues.call_args_list],
+            [
+                'project=MLX12345 and cf[10010] in ("ID_0", "ID_1")',
+                'project=MLX12345 and cf[10010] in ("ID_2", "ID_3")',
+                'project=MLX12345 and cf[10010] in ("ID_4")',
+            ])
+
+    def test_description_template(self, jira):
+        """ Placeholders in ``description_head`` can refer to attributes of the item and of its parent """
+        self.coll.get_item('MEETING-12345_2').caption = 'Weekly meeting'
+        self.settings['description_head'] = '<<meeting>> (<<parent>>), assigned to <<assignee>>\n\n'
+        self.settings['description_str_to_attr'] = {'<<meeting>>': 'parent.caption', '<<parent>>': 'parent.identifier',
+                                                    '<<assignee>>': 'assignee'}
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = []
+        jira_mock.project_components.return_value = produce_fake_components()
+
+        dut.create_jira_issues(self.settings, self.coll)
+
+        self.assertEqual(
+            [call.kwargs['fields']['description'] for call in jira_mock.create_issue.call_args_list],
+            [
+                'Weekly meeting (MEETING-12345_2), assigned to ABC\n\nDescription for action 1',
+                ' (), assigned to ZZZ\n\nCaption for action 2',
+            ])
+
+    def test_chunk_size(self, jira):
+        """ Items are resolved, deduplicated and created per chunk; the created issue keys are returned """
+        self.settings['item_id_field'] = 'labels'
+        self.settings['item_id_search_fallback'] = False
+        self.settings['chunk_size'] = 1
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = []
+        jira_mock.project_components.return_value = produce_fake_components()
+        jira_mock.create_issue.side_effect = [mock.MagicMock(key='MLX12345-1'), mock.MagicMock(key='MLX12345-2')]
+
+        created_issues = dut.create_unique_issues(['ACTION-12345_ACTION_1', 'ACTION-12345_ACTION_2'], jira_mock,
+                                                  {'issuetype': {'name': 'Task'}}, self.settings, self.coll)
+
+        self.assertEqual(created_issues, {'ACTION-12345_ACTION_1': 'MLX12345-1', 'ACTION-12345_ACTION_2': 'MLX12345-2'})
+        self.assertEqual(
+            [call.kwargs['jql_str'] for call in jira_mock.enhanced_search_issues.call_args_list],
+            [
+                'project=MLX12345 and labels in ("ACTION-12345_ACTION_1")',
+                'project=MLX12345 and labels in ("ACTION-12345_ACTION_2")',
+            ])
+
+    def test_circuit_breaker(self, jira):
+        """ Once Jira fails repeatedly, the remaining items are skipped with a single warning and stored for later """
+        self.settings['circuit_breaker_threshold'] = 1
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = []
+        jira_mock.project_components.return_value = produce_fake_components()
+        jira_mock.create_issue.side_effect = JIRAError(status_code=503, text='Service unavailable')
+
+        with TemporaryDirectory() as tmp_dir:
+            self.settings['pending_items_file'] = os.path.join(tmp_dir, 'pending.json')
+            with self.assertLogs(level=WARNING) as cm:
+                dut.create_jira_issues(self.settings, self.coll)
+
+            self.assertEqual(
+                cm.output,
+                ["WARNING:sphinx.mlx.jira_traceability:Jira interaction skipped 2 item(s) because Jira is unavailable: "
+                 "Jira circuit breaker tripped after 1 consecutive failures; last error: "
+                 "JIRA error: Service unavailable - HTTP 503"]
+            )
+            self.assertEqual(jira_mock.create_issue.call_count, 1)
+            with open(self.settings['pending_items_file'], encoding='utf-8') as file:
+                self.assertEqual(json.load(file), ['ACTION-12345_ACTION_1', 'ACTION-12345_ACTION_2'])
+
+            # the next run processes the pending items first and clears the file when done
+            with open(self.settings['pending_items_file'], 'w', encoding='utf-8') as file:
+                json.dump(['ACTION-12345_ACTION_2'], file)
+            jira_mock.create_issue.side_effect = None
+            dut.create_jira_issues(self.settings, self.coll)
+            self.assertEqual([call.kwargs['fields']['summary'] for call in jira_mock.create_issue.call_args_list[1:]],
+                             ['Caption for action 2', 'MEETING-12345_2: Action 1\'s caption?'])
+            self.assertFalse(os.path.exists(self.settings['pending_items_file']))
+
+    def test_circuit_breaker_errors_not_to_warnings(self, jira):
+        """ With ``errors_to_warnings`` disabled, one exception is raised after storing the skipped items """
+        self.settings['errors_to_warnings'] = False
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = []
+        jira_mock.project_components.return_value = produce_fake_components()
+        jira_mock.create_issue.side_effect = JIRAError(status_code=401, text='Unauthorized')
+
+        with TemporaryDirectory() as tmp_dir:
+            self.settings['pending_items_file'] = os.path.join(tmp_dir, 'pending.json')
+            with self.assertRaises(Exception) as ctx:
+                dut.create_jira_issues(self.settings, self.coll)
+
+            self.assertEqual(str(ctx.exception),
+                             "Jira interaction skipped 2 item(s) because Jira is unavailable: "
+                             "JIRA error: Unauthorized - HTTP 401")
+            with open(self.settings['pending_items_file'], encoding='utf-8') as file:
+                self.assertEqual(json.load(file), ['ACTION-12345_ACTION_1', 'ACTION-12345_ACTION_2'])
+
+    def test_offline_queue(self, jira):
+        """ Tickets get queued while Jira is unreachable and the queue gets flushed by the next run """
+        jira.side_effect = RequestsConnectionError('Connection refused')
+        jira_mock = mock.MagicMock()
+        jira_mock.enhanced_search_issues.return_value = []
+        jira_mock.project_components.return_value = produce_fake_components()
+
+        with TemporaryDirectory() as tmp_dir:
+            self.settings['offline_queue_file'] = os.path.join(tmp_dir, 'queue.jsonl')
+            with self.assertLogs(level=WARNING) as cm:
+                dut.create_jira_issues(self.settings, self.coll)
+            self.assertEqual(
+                cm.output,
+                ["WARNING:sphinx.mlx.jira_traceability:Jira is unreachable (Error: Connection refused); queued 2 "
+                 "ticket(s) in {}".format(self.settings['offline_queue_file'])]
+            )
+            queued = load_queue(self.settings['offline_queue_file'])
+            self.assertEqual([ticket['item_id'] for ticket in queued],
+                             ['ACTION-12345_ACTION_1', 'ACTION-12345_ACTION_2'])
+            self.assertEqual(queued[0]['effort'], '2w 3d 4h 55m')
+            self.assertEqual(queued[0]['attendees'], ['ABC', 'ZZZ'])
+
+            # Jira is reachable again: the queued tickets are created once and the queue gets removed
+            jira.side_effect = None
+            jira.return_value = jira_mock
+            dut.create_jira_issues(self.settings, self.coll)
+            self.assertCountEqual(
+                [call.kwargs['fields']['summary'] for call in jira_mock.create_issue.call_args_list],
+                ['MEETING-12345_2: Action 1\'s caption?', 'Caption for action 2'],
+            )
+            self.assertEqual(jira_mock.add_watcher.call_count, 2)
+            self.assertEqual(jira.call_count, 3)  # each flush worker connects on its own, after the failed attempt
+            self.assertFalse(os.path.exists(self.settings['offline_queue_file']))
+
+    def test_offline_queue_existing_issues(self, jira):
+        """ Queued items that turn out to exist already are not checked for duplicates again by the same run """
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = [mock.MagicMock(key='MLX12345-1')]
+        jira_mock.project_components.return_value = produce_fake_components()
+
+        with TemporaryDirectory() as tmp_dir:
+            self.settings['offline_queue_file'] = os.path.join(tmp_dir, 'queue.jsonl')
+            self.settings['warn_if_exists'] = False
+            dut.enqueue_tickets(self.settings['offline_queue_file'],
+                                dut.build_tickets(['ACTION-12345_ACTION_1', 'ACTION-12345_ACTION_2'],
+                                                  dut.build_general_fields(self.settings), self.settings, self.coll))
+
+            dut.create_jira_issues(self.settings, self.coll)
+
+            jira_mock.create_issue.assert_not_called()
+            self.assertEqual(jira_mock.enhanced_search_issues.call_count, 2)  # one query per queued item only
+            self.assertFalse(os.path.exists(self.settings['offline_queue_file']))
+
+    def test_build_parent_index(self, _):
+        """ The parent of each item is resolved once and its parsed attendees are shared between siblings """
+        self.coll.add_relation('ACTION-12345_ACTION_2', 'depends_on', 'MEETING-12345_2')
+        item_ids = ['ACTION-12345_ACTION_1', 'ACTION-12345_ACTION_2', 'ACTION-98765_ACTION_55']
+
+        parent_index = dut.build_parent_index(item_ids, ('depends_on', r'MEETING-\d+'), self.coll, '@example.com')
+
+        self.assertEqual(sorted(parent_index), ['ACTION-12345_ACTION_1', 'ACTION-12345_ACTION_2'])
+        info = parent_index['ACTION-12345_ACTION_1']
+        self.assertIs(parent_index['ACTION-12345_ACTION_2'], info)
+        self.assertEqual(info.parent_id, 'MEETING-12345_2')
+        self.assertIs(info.parent, self.coll.get_item('MEETING-12345_2'))
+        self.assertEqual(info.summary_prefix, 'MEETING-12345_2: ')
+        self.assertEqual(info.attendees, ('abc@example.com', 'zzz@example.com'))
+
+    def test_workers(self, jira):
+        """ Tickets are created concurrently with a Jira interface object per worker and results are merged in order """
+        self.settings['item_id_field'] = 'labels'
+        self.settings['item_id_search_fallback'] = False
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = []
+        jira_mock.project_components.return_value = produce_fake_components()
+        jira_mock.create_issue.side_effect = lambda fields: mock.MagicMock(key=fields['labels'][0] + '_KEY')
+
+        created_issues = dut.create_unique_issues(['ACTION-12345_ACTION_1', 'ACTION-12345_ACTION_2'],
+                                                  dut.connect_to_jira(self.settings),
+                                                  dut.build_general_fields(self.settings), self.settings, self.coll,
+                                                  workers=4)
+
+        self.assertEqual(list(created_issues.items()), [
+            ('ACTION-12345_ACTION_1', 'ACTION-12345_ACTION_1_KEY'),
+            ('ACTION-12345_ACTION_2', 'ACTION-12345_ACTION_2_KEY'),
+        ])
+        self.assertEqual(jira.call_count, 2)  # one extra connection for the second shard
+        self.assertEqual(jira_mock.project_components.call_count, 1)
+        # each worker looks up the existing issues of its own shard
+        self.assertCountEqual(
+            [call.kwargs['jql_str'] for call in jira_mock.enhanced_search_issues.call_args_list],
+            [
+                'project=MLX12345 and labels in ("ACTION-12345_ACTION_1")',
+                'project=MLX12345 and labels in ("ACTION-12345_ACTION_2")',
+            ])
+
+    def test_create_before_enrich(self, jira):
+        """ All tickets are created before their effort, watchers and assignee get set """
+        self.settings['notify_watchers'] = True
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = []
+        jira_mock.project_components.return_value = produce_fake_components()
+
+        dut.create_jira_issues(self.settings, self.coll)
+
+        call_names = [name for name, *_ in jira_mock.mock_calls
+                      if name in ('create_issue', 'create_issue().update', 'add_watcher', 'assign_issue')]
+        self.assertEqual(call_names, ['create_issue', 'create_issue', 'create_issue().update', 'add_watcher',
+                                      'add_watcher', 'assign_issue', 'assign_issue'])
+
+    def test_enrichment_skipped_when_jira_unavailable(self, jira):
+        """ A single warning is reported for the issues that could not be enriched because Jira went down """
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = []
+        jira_mock.project_components.return_value = produce_fake_components()
+        jira_mock.create_issue.return_value.key = 'MLX12345-1'
+        jira_mock.create_issue.return_value.update.side_effect = RequestsConnectionError('Connection refused')
+
+        with self.assertLogs(level=WARNING) as cm:
+            dut.create_jira_issues(self.settings, self.coll)
+
+        self.assertEqual(jira_mock.create_issue.call_count, 2)
+        self.assertEqual(
+            cm.output,
+            ["WARNING:sphinx.mlx.jira_traceability:Could not set the effort, watchers and assignee of 1 Jira issue(s) "
+             "because Jira is unavailable: MLX12345-1"]
+        )
+
+    def test_time_budget(self, jira):
+        """ No new items are processed once the time budget is nearly used up; the rest is stored for the next run """
+        self.settings['time_budget_seconds'] = 10
+        clock = [0.0]
+
+        def create_issue(**_):
+            clock[0] += 6
+            return mock.MagicMock(key='MLX12345-1')
+
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = []
+        jira_mock.project_components.return_value = produce_fake_components()
+        jira_mock.create_issue.side_effect = create_issue
+
+        with TemporaryDirectory() as tmp_dir, mock.patch.object(dut, 'monotonic', lambda: clock[0]):
+            self.settings['pending_items_file'] = os.path.join(tmp_dir, 'pending.json')
+            with self.assertLogs(level=WARNING) as cm:
+                dut.create_jira_issues(self.settings, self.coll)
+
+            # the second item would take 6 s on average while only 4 s are left
+            self.assertEqual(jira_mock.create_issue.call_count, 1)
+            self.assertEqual(
+                cm.output,
+                ["WARNING:sphinx.mlx.jira_traceability:Jira interaction stopped after 10 s because of the time budget; "
+                 "1 item(s) are left for the next run"]
+            )
+            self.assertEqual(jira_mock.add_watcher.call_count, 2)  # the created issue still gets enriched
+            with open(self.settings['pending_items_file'], encoding='utf-8') as file:
+                self.assertEqual(json.load(file), ['ACTION-12345_ACTION_2'])
+
+    def test_time_budget_pending_enrichments(self, jira):
+        """ Issues that are not enriched because of the time budget get enriched by the next run """
+        self.settings['time_budget_seconds'] = 10
+        clock = [0.0]
+        created_issue = mock.MagicMock(key='MLX12345-1')
+
+        def create_issue(**_):
+            clock[0] += 11
+            return created_issue
+
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = []
+        jira_mock.issue.return_value = created_issue
+        jira_mock.project_components.return_value = produce_fake_components()
+        jira_mock.create_issue.side_effect = create_issue
+
+        with TemporaryDirectory() as tmp_dir, mock.patch.object(dut, 'monotonic', lambda: clock[0]):
+            self.settings['pending_enrichments_file'] = os.path.join(tmp_dir, 'pending_enrichments.jsonl')
+            with self.assertLogs(level=WARNING):
+                dut.create_jira_issues(self.settings, self.coll)
+            created_issue.update.assert_not_called()
+            jira_mock.add_watcher.assert_not_called()
+            pending = load_queue(self.settings['pending_enrichments_file'])
+            self.assertEqual([(ticket['item_id'], ticket['issue_key']) for ticket in pending],
+                             [('ACTION-12345_ACTION_1', 'MLX12345-1')])
+
+            # the next run enriches the issue first and clears the file when done
+            self.settings.pop('time_budget_seconds')
+            self.coll = TraceableCollection()
+            dut.create_jira_issues(self.settings, self.coll)
+            jira_mock.issue.assert_called_once_with('MLX12345-1')
+            created_issue.update.assert_called_once_with(fields={'timetracking': {'originalEstimate': '2w 3d 4h 55m'}})
+            self.assertEqual([call.args[1] for call in jira_mock.add_watcher.call_args_list], ['ABC', 'ZZZ'])
+            self.assertFalse(os.path.exists(self.settings['pending_enrichments_file']))
+
+    def test_pending_enrichments_unknown_issue(self, jira):
+        """ Pending enrichments of issues that cannot be looked up get dropped without affecting the other issues """
+        known_issue = mock.MagicMock(key='MLX12345-1')
+
+        def lookup_issue(key):
+            if key == 'MLX12345-2':
+                raise JIRAError(status_code=400, text="An issue with key 'MLX12345-2' does not exist")
+            return known_issue
+
+        jira_mock = jira.return_value
+        jira_mock.issue.side_effect = lookup_issue
+        jira_mock.enhanced_search_issues.return_value = []
+        tickets = dut.build_tickets(['ACTION-12345_ACTION_1', 'ACTION-12345_ACTION_2'],
+                                    dut.build_general_fields(self.settings), self.settings, self.coll)
+
+        with TemporaryDirectory() as tmp_dir:
+            self.settings['pending_enrichments_file'] = os.path.join(tmp_dir, 'pending_enrichments.jsonl')
+            dut.enqueue_tickets(self.settings['pending_enrichments_file'],
+                                [dict(ticket, issue_key='MLX12345-{}'.format(index))
+                                 for index, ticket in enumerate(tickets, start=1)])
+            with self.assertLogs(level=WARNING) as cm:
+                dut.enrich_pending_issues(dut.connect_to_jira(self.settings), self.settings)
+
+            self.assertEqual(len(cm.output), 1)
+            self.assertIn("Dropping Jira issue MLX12345-2 from {}".format(self.settings['pending_enrichments_file']),
+                          cm.output[0])
+            known_issue.update.assert_called_once_with(fields={'timetracking': {'originalEstimate': '2w 3d 4h 55m'}})
+            self.assertEqual([call.args[1] for call in jira_mock.add_watcher.call_args_list], ['ABC', 'ZZZ'])
+            self.assertFalse(os.path.exists(self.settings['pending_enrichments_file']))
+
+    def test_time_budget_offline_queue(self, jira):
+        """ Queued tickets are not flushed once the deadline has passed and remain in the queue """
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = []
+        jira_mock.project_components.return_value = produce_fake_components()
+
+        with TemporaryDirectory() as tmp_dir:
+            self.settings['offline_queue_file'] = os.path.join(tmp_dir, 'queue.jsonl')
+            tickets = dut.build_tickets(['ACTION-12345_ACTION_1', 'ACTION-12345_ACTION_2'],
+                                        dut.build_general_fields(self.settings), self.settings, self.coll)
+            dut.enqueue_tickets(self.settings['offline_queue_file'], tickets)
+
+            with self.assertLogs(level=WARNING) as cm:
+                created_issues, resolved_item_ids = dut.flush_offline_queue(dut.connect_to_jira(self.settings),
+                                                                            self.settings, deadline=0.0)
+
+            self.assertEqual(created_issues, {})
+            self.assertEqual(resolved_item_ids, set())
+            jira_mock.create_issue.assert_not_called()
+            self.assertEqual(
+                cm.output,
+                ["WARNING:sphinx.mlx.jira_traceability:2 queued ticket(s) remain in {} because of the time budget"
+                 .format(self.settings['offline_queue_file'])]
+            )
+            self.assertEqual([ticket['item_id'] for ticket in load_queue(self.settings['offline_queue_file'])],
+                             ['ACTION-12345_ACTION_1', 'ACTION-12345_ACTION_2'])
+
+    def test_enrichment_thread_per_client(self, _):
+        """ The issues created by the same Jira interface object are enriched sequentially by a single thread """
+        threads = {}
+
+        def make_client(name):
+            client = mock.MagicMock()
+            client.assign_issue.side_effect = lambda *_: threads.setdefault(name, set()).add(threading.get_ident())
+            return client
+
+        clients = [make_client('first'), make_client('second')]
+        enrichments = [(clients[index % 2], mock.MagicMock(key='MLX12345-{}'.format(index)),
+                        {'effort': '', 'attendees': (), 'assignee': 'ABC'}) for index in range(8)]
+
+        self.assertEqual(dut.enrich_issues(enrichments, workers=8), [])
+
+        self.assertEqual(sorted(threads), ['first', 'second'])
+        self.assertEqual([len(idents) for idents in threads.values()], [1, 1])
+        for client in clients:
+            self.assertEqual(client.assign_issue.call_count, 4)
+
+    def test_time_budget_enrichment(self, _):
+        """ Issues are not enriched once the deadline has passed """
+        issue = mock.MagicMock(key='MLX12345-1')
+
+        with self.assertLogs(level=WARNING) as cm:
+            dut.enrich_issues([(mock.MagicMock(), issue, {'effort': '1d'})], deadline=0.0)
+
+        issue.update.assert_not_called()
+        self.assertEqual(
+            cm.output,
+            ["WARNING:sphinx.mlx.jira_traceability:Skipped setting the effort, watchers and assignee of 1 Jira "
+             "issue(s) because of the time budget: MLX12345-1"]
+        )
+
+    def test_session_cache(self, jira):
+        """ Cached session cookies are passed to Jira; a rejected session gets replaced by a new login """
+        with TemporaryDirectory() as tmp_dir:
+            self.settings['session_cache_file'] = os.path.join(tmp_dir, 'jira_session.json')
+            jira.return_value._session.cookies = cookiejar_from_dict({'JSESSIONID': 'abc'})
+            dut.connect_to_jira(self.settings)
+            self.assertNotIn('cookies', jira.call_args.args[0])
+
+            self.assertEqual(jira.call_args.kwargs, {'basic_auth': ('my_username', 'my_password')})
+
+            # the next build authenticates with the cached cookies only
+            dut.connect_to_jira(self.settings)
+            self.assertEqual(jira.call_args.args[0]['cookies'].get_dict(), {'JSESSIONID': 'abc'})
+            self.assertEqual(jira.call_args.kwargs, {'validate': True})
+
+            # a rejected session gets replaced by a login with the credentials
+            jira.side_effect = [JIRAError(status_code=401, text='Unauthorized'), jira.return_value]
+            dut.connect_to_jira(self.settings)
+            self.assertEqual(jira.call_args_list[2].args[0]['cookies'].get_dict(), {'JSESSIONID': 'abc'})
+            self.assertNotIn('cookies', jira.call_args_list[3].args[0])
+            self.assertEqual(jira.call_args_list[3].kwargs, {'basic_auth': ('my_username', 'my_password')})
+
+    def test_enrichment_circuit_breaker(self, jira):
+        """ Watcher lookups that fail because Jira went down trip the circuit breaker, skipping the remaining calls """
+        self.settings['circuit_breaker_threshold'] = 2
+        self.settings['notify_watchers'] = True
+
+        def add_watcher(*_):
+            # the jira library re-raises errors of user lookups as a JIRAError without status code
+            try:
+                raise RequestsConnectionError('Connection refused')
+            except RequestsConnectionError as err:
+                raise JIRAError(str(err))
+
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = []
+        jira_mock.project_components.return_value = produce_fake_components()
+        jira_mock.create_issue.side_effect = [mock.MagicMock(key='MLX12345-1'), mock.MagicMock(key='MLX12345-2')]
+        jira_mock.add_watcher.side_effect = add_watcher
+
+        with self.assertLogs(level=WARNING) as cm:
+            dut.create_jira_issues(self.settings, self.coll)
+
+        self.assertEqual(jira_mock.add_watcher.call_count, 2)
+        jira_mock.assign_issue.assert_not_called()
+        self.assertEqual(
+            cm.output,
+            ["WARNING:sphinx.mlx.jira_traceability:Could not add watcher ABC to issue MLX12345-1: Connection refused",
+             "WARNING:sphinx.mlx.jira_traceability:Could not add watcher ZZZ to issue MLX12345-1: Connection refused",
+             "WARNING:sphinx.mlx.jira_traceability:Could not set the effort, watchers and assignee of 2 Jira issue(s) "
+             "because Jira is unavailable: MLX12345-1, MLX12345-2"]
+        )
@@ -0,0 +1,60 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from mlx.jira_traceability import offline_queue as dut
+
+
+def make_ticket(item_id, summary='Summary'):
+    return {
+        'item_id': item_id,
+        'project': 'MLX12345',
+        'fields': {'project': {'key': 'MLX12345'}, 'summary': summary, 'issuetype': {'name': 'Task'}},
+        'attendees': [],
+        'assignee': '',
+        'effort': '',
+        'content': '',
+    }
+
+
+class TestOfflineQueue(TestCase):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.queue_file = os.path.join(self.tmp_dir.name, 'queue', 'jira.jsonl')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_missing_queue(self):
+        self.assertEqual(dut.load_queue(self.queue_file), [])
+
+    def test_enqueue_replaces_tickets_of_same_item(self):
+        dut.enqueue_tickets(self.queue_file, [make_ticket('ITEM_1'), make_ticket('ITEM_2')])
+        dut.enqueue_tickets(self.queue_file, [make_ticket('ITEM_1', summary='Updated')])
+
+        queued = dut.load_queue(self.queue_file)
+        self.assertEqual([ticket['item_id'] for ticket in queued], ['ITEM_2', 'ITEM_1'])
+        self.assertEqual(queued[1]['fields']['summary'], 'Updated')
+
+    def test_save_empty_queue_removes_file(self):
+        dut.save_queue(self.queue_file, [make_ticket('ITEM_1')])
+        self.assertTrue(os.path.exists(self.queue_file))
+        dut.save_queue(self.queue_file, [])
+        self.assertFalse(os.path.exists(self.queue_file))
+
+    @mock.patch('mlx.jira_traceability.jira_interaction.JIRA')
+    def test_main_flushes_queue(self, jira):
+        """ The queue configured in conf.py gets flushed by the command line interface """
+        with open(os.path.join(self.tmp_dir.name, 'conf.py'), 'w', encoding='utf-8') as conf:
+            conf.write("traceability_jira_automation = {{'api_endpoint': 'https://jira.example.com', "
+                       "'username': 'abc', 'password': 'pwd', 'jira_field_id': 'summary', "
+                       "'offline_queue_file': {!r}}}\n".format(self.queue_file))
+        dut.save_queue(self.queue_file, [make_ticket('ITEM_1'), make_ticket('ITEM_2')])
+        jira_mock = jira.return_value
+        jira_mock.enhanced_search_issues.return_value = []
+
+        exit_code = dut.main([self.tmp_dir.name, '--workers', '2'])
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(jira_mock.create_issue.call_count, 2)
+        self.assertFalse(os.path.exists(self.queue_file))
@@ -0,0 +1,64 @@
+import os
+import pstats
+from tempfile import TemporaryDirectory
+from threading import Thread
+from time import sleep
+from unittest import TestCase, mock
+
+from requests.adapters import HTTPAdapter
+
+from mlx.jira_traceability import profiling as dut
+
+
+def fake_send(*_, **__):
+    sleep(0.02)
+
+
+class TestJiraProfiler(TestCase):
+    @mock.patch.object(HTTPAdapter, 'send', fake_send)
+    def test_network_time_per_operation(self):
+        """ Network wait is attributed to the Jira operation that caused it and the profile gets stored """
+        jira_mock = mock.MagicMock()
+        jira_mock.search_issues.side_effect = lambda **_: HTTPAdapter.send(HTTPAdapter())
+        with TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, 'profile', 'jira.prof')
+            with dut.JiraProfiler(output_path) as profiler:
+                jira = dut.wrap_client(jira_mock)
+                jira.search_issues(jql_str='project=ABC')
+                jira.search_issues(jql_str='project=ABC')
+                with dut.track_operation('update_issue'):
+                    pass
+                HTTPAdapter.send(HTTPAdapter())
+
+            self.assertIs(HTTPAdapter.send, fake_send)
+            calls, wall, network = profiler.operations['search_issues']
+            self.assertEqual(calls, 2)
+            self.assertGreaterEqual(network, 0.04)
+            self.assertGreaterEqual(wall, network)
+            self.assertEqual(profiler.operations['update_issue'][0], 1)
+            self.assertGreaterEqual(profiler.unattributed_network, 0.02)
+            pstats.Stats(output_path)  # valid cProfile output
+            with open(output_path + '.txt', encoding='utf-8') as report:
+                self.assertIn('search_issues', report.read())
+
+    def test_worker_threads(self):
+        """ The profile covers the threads started during the Jira phase, e.g. the workers that create tickets """
+        def create_tickets():
+            sum(range(1000))
+
+        with TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, 'jira.prof')
+            with dut.JiraProfiler(output_path):
+                worker = Thread(target=create_tickets)
+                worker.start()
+                worker.join()
+
+            functions = [function for _, _, function in pstats.Stats(output_path).stats]
+            self.assertIn('create_tickets', functions)
+
+    def test_inactive(self):
+        """ Without an active profiler, the Jira interface object is used as is """
+        jira_mock = mock.MagicMock()
+        self.assertIs(dut.wrap_client(jira_mock), jira_mock)
+        with dut.track_operation('connect'):
+            pass
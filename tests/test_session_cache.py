@@ -0,0 +1,110 @@
+import json
+import os
+import stat
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from jira import JIRAError
+from requests import Session
+from requests.cookies import RequestsCookieJar
+
+from mlx.jira_traceability.session_cache import SessionCache
+
+SERVER = 'https://jira.example.com'
+
+
+def make_cookies(**values):
+    cookies = RequestsCookieJar()
+    for name, value in values.items():
+        cookies.set(name, value, domain='jira.example.com', path='/')
+    return cookies
+
+
+class TestSessionCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmp_dir.name, 'jira_session.json')
+        self.cache = SessionCache(self.cache_file, SERVER, 'user')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_reused_by_next_build(self):
+        """ Stored session cookies are loaded for the same server and user only, and are private to the user """
+        self.cache.save(make_cookies(JSESSIONID='abc', **{'atlassian.xsrf.token': 'xyz'}))
+
+        cookies = SessionCache(self.cache_file, SERVER, 'user').load()
+
+        self.assertEqual(cookies.get_dict(), {'JSESSIONID': 'abc', 'atlassian.xsrf.token': 'xyz'})
+        self.assertEqual(stat.S_IMODE(os.stat(self.cache_file).st_mode), 0o600)
+        self.assertIsNone(SessionCache(self.cache_file, SERVER, 'other_user').load())
+        self.assertIsNone(SessionCache(self.cache_file, 'https://other.example.com', 'user').load())
+
+    def test_expiry(self):
+        """ Session cookies are not reused after the TTL """
+        self.cache.save(make_cookies(JSESSIONID='abc'))
+
+        with mock.patch('mlx.jira_traceability.session_cache.time', return_value=4000000000.0):
+            self.assertIsNone(self.cache.load())
+
+    def test_invalid_file(self):
+        with open(self.cache_file, 'w', encoding='utf-8') as file:
+            file.write('{')
+
+        with self.assertLogs(level='WARNING'):
+            self.assertIsNone(self.cache.load())
+
+    def test_unexpected_content(self):
+        """ A file with valid JSON of an unexpected shape is treated as having no cached session """
+        for content in ([], {'server': SERVER, 'username': 'user', 'cookies': []},
+                        {'server': SERVER, 'username': 'user', 'expires': 'never', 'cookies': []},
+                        {'server': SERVER, 'username': 'user', 'expires': 1e12, 'cookies': [{'value': 'abc'}]}):
+            with self.subTest(content=content):
+                with open(self.cache_file, 'w', encoding='utf-8') as file:
+                    json.dump(content, file)
+
+                with self.assertLogs(level='WARNING'):
+                    self.assertIsNone(self.cache.load())
+
+    def test_reused_session_keeps_expiry(self):
+        """ Reusing a session does not extend the time during which it may be reused """
+        with mock.patch('mlx.jira_traceability.session_cache.time', return_value=1000.0):
+            self.cache.save(make_cookies(JSESSIONID='abc'))
+        session = Session()
+
+        with mock.patch('mlx.jira_traceability.session_cache.time', return_value=4000.0):
+            cache = SessionCache(self.cache_file, SERVER, 'user')
+            session.cookies.update(cache.load())
+            cache.install(session, ('user', 'password'))
+            self.assertIsNone(session.auth)
+        with mock.patch('mlx.jira_traceability.session_cache.time', return_value=4700.0):
+            self.assertIsNone(SessionCache(self.cache_file, SERVER, 'user').load())
+
+    def test_reauthenticate_on_401(self):
+        """ A rejected session is dropped and the request is sent again once with the credentials, after which the new
+        cookies are stored """
+        session = Session()
+        session.cookies.update(make_cookies(JSESSIONID='expired'))
+        responses = [JIRAError(status_code=401, text='Unauthorized'), mock.sentinel.response]
+
+        def send(*_, **__):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            session.cookies.update(make_cookies(JSESSIONID='fresh'))
+            return response
+
+        session.request = mock.MagicMock(side_effect=send)
+        send_mock = session.request
+        self.cache.install(session, ('user', 'password'))
+
+        self.assertIs(session.request('GET', SERVER + '/rest/api/2/serverInfo'), mock.sentinel.response)
+        self.assertEqual(send_mock.call_count, 2)
+        self.assertEqual(session.auth, ('user', 'password'))
+        self.assertEqual(self.cache.load().get_dict(), {'JSESSIONID': 'fresh'})
+
+        # a session that has been started with the credentials gets rejected for other reasons
+        send_mock.side_effect = JIRAError(status_code=401, text='Unauthorized')
+        with self.assertRaises(JIRAError):
+            session.request('GET', SERVER + '/rest/api/2/serverInfo')
+        self.assertEqual(send_mock.call_count, 3)